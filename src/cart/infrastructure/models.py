@@ -3,6 +3,27 @@ from django.conf import settings
 from products.infrastructure.models import Product
 
 
+class CartItemQuerySet(models.QuerySet):
+    def detail_values(self):
+        return self.values('id', 'user_id', 'quantity', 'product_id', 'product__name', 'product__price')
+
+    @staticmethod
+    def detail_dicts(rows):
+        return [
+            {
+                'id': row['id'],
+                'user': row['user_id'],
+                'product': {
+                    'id': row['product_id'],
+                    'name': row['product__name'],
+                    'price': str(row['product__price']),
+                },
+                'quantity': row['quantity'],
+            }
+            for row in rows
+        ]
+
+
 class CartItem(models.Model):
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
@@ -12,8 +33,13 @@ class CartItem(models.Model):
     product = models.ForeignKey(Product, on_delete=models.CASCADE)
     quantity = models.PositiveIntegerField(default=1)
 
+    objects = CartItemQuerySet.as_manager()
+
     class Meta:
         unique_together = ('user', 'product')
+        indexes = [
+            models.Index(fields=['user', 'id'], name='cart_item_user_id_idx'),
+        ]
 
     def __str__(self):
         return f"{self.product.name} x{self.quantity}"
@@ -0,0 +1,18 @@
+import django_filters
+from cart.infrastructure.models import CartItem
+from django import forms
+
+
+class IntegerFilter(django_filters.NumberFilter):
+    field_class = forms.IntegerField
+
+
+class CartItemFilter(django_filters.FilterSet):
+    user_id = IntegerFilter(
+        field_name='user_id',
+        error_messages={'invalid': 'Параметр user_id має бути цілим числом.'}
+    )
+
+    class Meta:
+        model = CartItem
+        fields = ['user_id']
@@ -1,4 +1,3 @@
-from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
 from common.serializers import ExampleIgnoringModelSerializer
 from cart.infrastructure.models import CartItem
@@ -25,8 +24,14 @@ class PatchedCartItemSerializer(ExampleIgnoringModelSerializer):
         }
 
 
+class CartProductSerializer(serializers.Serializer):
+    id = serializers.IntegerField(read_only=True)
+    name = serializers.CharField(read_only=True)
+    price = serializers.DecimalField(max_digits=10, decimal_places=2, read_only=True)
+
+
 class CartItemDetailSerializer(ExampleIgnoringModelSerializer):
-    product = serializers.SerializerMethodField()
+    product = CartProductSerializer(read_only=True)
 
     class Meta:
         model = CartItem
@@ -36,11 +41,3 @@ class CartItemDetailSerializer(ExampleIgnoringModelSerializer):
             'user': {'required': True},
             'quantity': {'required': True},
         }
-
-    @extend_schema_field(serializers.IntegerField())
-    def get_product(self, obj):
-        return {
-            'id': obj.product.id,
-            'name': obj.product.name,
-            'price': obj.product.price,
-        }
@@ -1,10 +1,64 @@
-from cart.infrastructure.models import CartItem
+from cart.infrastructure.models import CartItem, CartItemQuerySet
+from cart.interfaces.filters import CartItemFilter
 from cart.interfaces.serializers import (CartItemSerializer, PatchedCartItemSerializer, CartItemDetailSerializer)
+from common.renderers import ORJSONRenderer
+from django_filters.rest_framework import DjangoFilterBackend
+from django.db import IntegrityError, transaction
 from drf_spectacular.utils import extend_schema, OpenApiExample, extend_schema_view, OpenApiParameter
-from rest_framework import viewsets, status
+from rest_framework import status, viewsets
+from rest_framework.filters import OrderingFilter
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 
+USER_ID_REQUIRED_ERROR = {'user_id': 'Параметр user_id є обов\'язковим.'}
+DUPLICATE_CART_ITEMS_ERROR = {'product': 'Товар не може повторюватися в кошику одного користувача.'}
+CART_BULK_CREATE_BATCH_SIZE = 500
+
+CART_ITEM_EXAMPLE_VALUE = {
+    'id': 1,
+    'user': 1,
+    'product': {'id': 1, 'name': 'Шахи', 'price': '29.99'},
+    'quantity': 2
+}
+
+CART_LIST_EXAMPLE = OpenApiExample(
+    name='Список усіх товарів у кошиках',
+    summary='GET /api/carts/',
+    value=[CART_ITEM_EXAMPLE_VALUE],
+    response_only=True
+)
+CART_USER_LIST_EXAMPLE = OpenApiExample(
+    name='Список товарів у кошику конкретного користувача',
+    summary='GET /api/carts/?user_id=1',
+    value=[CART_ITEM_EXAMPLE_VALUE],
+    response_only=True
+)
+CART_RETRIEVE_EXAMPLE = OpenApiExample(
+    name='Отримати конкретний товар у кошику',
+    summary='GET /api/carts/{id}/?user_id={user_id}',
+    value=CART_ITEM_EXAMPLE_VALUE,
+    response_only=True
+)
+CART_CREATE_EXAMPLE = OpenApiExample(
+    name='Додати до кошика',
+    summary='POST /api/carts/',
+    value={'user': 1, 'product': 1, 'quantity': 2},
+    request_only=True
+)
+CART_PATCH_EXAMPLE = OpenApiExample(
+    name='Оновити кількість товару в кошику',
+    summary='PATCH /api/carts/{id}/?user_id={user_id}',
+    description="Оновлює кількість товару в кошику. ID запису в кошику передається в URL.",
+    value={'quantity': 3},
+    request_only=True
+)
+
+CART_ITEM_ID_PARAMETER = OpenApiParameter("id", type=int, location=OpenApiParameter.PATH,
+                                          description="Ідентифікатор запису в кошику (CartItem ID)")
+CART_USER_ID_PARAMETER = OpenApiParameter("user_id", type=int, location=OpenApiParameter.QUERY,
+                                          description="ID користувача (обов'язковий)", required=True)
+
 
 @extend_schema_view(
     list=extend_schema(
@@ -19,197 +73,78 @@ from rest_framework.response import Response
             )
         ],
         responses={200: CartItemDetailSerializer(many=True)},
-        examples=[
-            OpenApiExample(
-                name='Список усіх товарів у кошиках',
-                summary='GET /api/carts/',
-                value=[
-                    {
-                        'id': 1,
-                        'user': 1,
-                        'product': {'id': 1, 'name': 'Шахи', 'price': '29.99'},
-                        'quantity': 2
-                    }
-                ],
-                response_only=True
-            ),
-            OpenApiExample(
-                name='Список товарів у кошику конкретного користувача',
-                summary='GET /api/carts/?user_id=1',
-                value=[
-                    {
-                        'id': 1,
-                        'user': 1,
-                        'product': {'id': 1, 'name': 'Шахи', 'price': '29.99'},
-                        'quantity': 2
-                    }
-                ],
-                response_only=True
-            )
-        ]
+        examples=[CART_LIST_EXAMPLE, CART_USER_LIST_EXAMPLE]
     ),
     retrieve=extend_schema(
         operation_id='api_carts_get_item',
-        parameters=[
-            OpenApiParameter("id", type=int, location=OpenApiParameter.PATH,
-                             description="Ідентифікатор запису в кошику (CartItem ID)"),
-            OpenApiParameter("user_id", type=int, location=OpenApiParameter.QUERY,
-                             description="ID користувача (обов'язковий)", required=True)
-        ],
+        parameters=[CART_ITEM_ID_PARAMETER, CART_USER_ID_PARAMETER],
         responses={200: CartItemDetailSerializer},
-        examples=[
-            OpenApiExample(
-                name='Отримати конкретний товар у кошику',
-                summary='GET /api/carts/{id}/?user_id={user_id}',
-                value={
-                    'id': 1,
-                    'user': 1,
-                    'product': {'id': 1, 'name': 'Шахи', 'price': '29.99'},
-                    'quantity': 2
-                },
-                response_only=True
-            )
-        ]
+        examples=[CART_RETRIEVE_EXAMPLE]
     ),
     create=extend_schema(
         operation_id='api_carts_add_item',
         request=CartItemSerializer,
         responses={201: CartItemDetailSerializer},
-        examples=[
-            OpenApiExample(
-                name='Додати до кошика',
-                summary='POST /api/carts/',
-                value={'user': 1, 'product': 1, 'quantity': 2},
-                request_only=True
-            ),
-        ]
+        examples=[CART_CREATE_EXAMPLE]
     ),
     partial_update=extend_schema(
         operation_id='api_carts_update_item',
-        parameters=[
-            OpenApiParameter("id", type=int, location=OpenApiParameter.PATH,
-                             description="Ідентифікатор запису в кошику (CartItem ID)"),
-            OpenApiParameter("user_id", type=int, location=OpenApiParameter.QUERY,
-                             description="ID користувача (обов'язковий)", required=True)
-        ],
+        parameters=[CART_ITEM_ID_PARAMETER, CART_USER_ID_PARAMETER],
         request=PatchedCartItemSerializer,
         responses={200: CartItemDetailSerializer},
-        examples=[
-            OpenApiExample(
-                name='Оновити кількість товару в кошику',
-                summary='PATCH /api/carts/{id}/?user_id={user_id}',
-                description="Оновлює кількість товару в кошику. ID запису в кошику передається в URL.",
-                value={'quantity': 3},
-                request_only=True
-            )
-        ]
+        examples=[CART_PATCH_EXAMPLE]
     ),
     destroy=extend_schema(
         operation_id='api_carts_remove_item',
-        parameters=[
-            OpenApiParameter("id", type=int, location=OpenApiParameter.PATH,
-                             description="Ідентифікатор запису в кошику (CartItem ID)"),
-            OpenApiParameter("user_id", type=int, location=OpenApiParameter.QUERY,
-                             description="ID користувача (обов'язковий)", required=True)
-        ],
+        parameters=[CART_ITEM_ID_PARAMETER, CART_USER_ID_PARAMETER],
         responses={204: None}
     ),
 )
 @extend_schema(tags=['Carts'])
 class CartItemViewSet(viewsets.ModelViewSet):
     permission_classes = [AllowAny]
+    queryset = CartItem.objects.select_related('product').order_by('id')
+    renderer_classes = [ORJSONRenderer]
     serializer_class = CartItemSerializer
+    serializer_class_by_action = {
+        'list': CartItemDetailSerializer,
+        'retrieve': CartItemDetailSerializer,
+        'partial_update': PatchedCartItemSerializer,
+    }
+    filter_backends = [DjangoFilterBackend, OrderingFilter]
+    filterset_class = CartItemFilter
     lookup_field = 'pk'
     lookup_url_kwarg = 'pk'
+    user_scoped_actions = ('retrieve', 'update', 'partial_update', 'destroy')
 
-    def get_queryset(self):
-        queryset = CartItem.objects.all().order_by('id')
-
-        user_id = self.request.query_params.get('user_id', None)
-        if user_id is not None:
-            try:
-                user_id = int(user_id)
-                queryset = queryset.filter(user_id=user_id)
-            except ValueError:
-                return CartItem.objects.none().order_by('id')
-
-        return queryset
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if self.action in self.user_scoped_actions and not request.query_params.get('user_id'):
+            raise ValidationError(USER_ID_REQUIRED_ERROR)
 
     def get_serializer_class(self):
-        if self.action in ['list', 'retrieve']:
-            return CartItemDetailSerializer
-        if self.action in ['partial_update']:
-            return PatchedCartItemSerializer
-        return CartItemSerializer
+        return self.serializer_class_by_action.get(self.action, self.serializer_class)
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset()).detail_values()
+        page = self.paginate_queryset(queryset)
+        data = CartItemQuerySet.detail_dicts(queryset if page is None else page)
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
+
+    def create(self, request, *args, **kwargs):
+        if not isinstance(request.data, list):
+            return super().create(request, *args, **kwargs)
+        serializer = self.get_serializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+        items = [CartItem(**item) for item in serializer.validated_data]
+        try:
+            with transaction.atomic():
+                CartItem.objects.bulk_create(items, batch_size=CART_BULK_CREATE_BATCH_SIZE)
+        except IntegrityError:
+            raise ValidationError(DUPLICATE_CART_ITEMS_ERROR)
+        return Response(self.get_serializer(items, many=True).data, status=status.HTTP_201_CREATED)
 
     def perform_create(self, serializer):
         serializer.save()
-
-    def retrieve(self, request, *args, **kwargs):
-        user_id = request.query_params.get('user_id')
-        if not user_id:
-            return Response({'detail': 'Параметр user_id є обов\'язковим.'}, status=status.HTTP_400_BAD_REQUEST)
-        try:
-            user_id = int(user_id)
-        except ValueError:
-            return Response({'detail': 'Параметр user_id має бути цілим числом.'}, status=status.HTTP_400_BAD_REQUEST)
-
-        cart_item = self.get_object()
-
-        if cart_item.user_id != user_id:
-            return Response({'detail': 'Запис кошика не належить вказаному користувачу.'},
-                            status=status.HTTP_403_FORBIDDEN)
-
-        serializer = self.get_serializer(cart_item)
-        return Response(serializer.data)
-
-    def update(self, request, *args, **kwargs):
-        user_id = request.query_params.get('user_id')
-        if not user_id:
-            return Response({'detail': 'Параметр user_id є обов\'язковим.'}, status=status.HTTP_400_BAD_REQUEST)
-        try:
-            user_id = int(user_id)
-        except ValueError:
-            return Response({'detail': 'Параметр user_id має бути цілим числом.'}, status=status.HTTP_400_BAD_REQUEST)
-
-        cart_item = self.get_object()
-
-        if cart_item.user_id != user_id:
-            return Response({'detail': 'Запис кошика не належить вказаному користувачу.'},
-                            status=status.HTTP_403_FORBIDDEN)
-
-        return super().update(request, *args, **kwargs)
-
-    def partial_update(self, request, *args, **kwargs):
-        user_id = request.query_params.get('user_id')
-        if not user_id:
-            return Response({'detail': 'Параметр user_id є обов\'язковим.'}, status=status.HTTP_400_BAD_REQUEST)
-        try:
-            user_id = int(user_id)
-        except ValueError:
-            return Response({'detail': 'Параметр user_id має бути цілим числом.'}, status=status.HTTP_400_BAD_REQUEST)
-
-        cart_item = self.get_object()
-
-        if cart_item.user_id != user_id:
-            return Response({'detail': 'Запис кошика не належить вказаному користувачу.'},
-                            status=status.HTTP_403_FORBIDDEN)
-
-        return super().partial_update(request, *args, **kwargs)
-
-    def destroy(self, request, *args, **kwargs):
-        user_id = request.query_params.get('user_id')
-        if not user_id:
-            return Response({'detail': 'Параметр user_id є обов\'язковим.'}, status=status.HTTP_400_BAD_REQUEST)
-        try:
-            user_id = int(user_id)
-        except ValueError:
-            return Response({'detail': 'Параметр user_id має бути цілим числом.'}, status=status.HTTP_400_BAD_REQUEST)
-
-        cart_item = self.get_object()
-
-        if cart_item.user_id != user_id:
-            return Response({'detail': 'Запис кошика не належить вказаному користувачу.'},
-                            status=status.HTTP_403_FORBIDDEN)
-
-        return super().destroy(request, *args, **kwargs)
\ No newline at end of file
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.4 on 2026-10-16 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cart', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='cartitem',
+            index=models.Index(fields=['user', 'id'], name='cart_item_user_id_idx'),
+        ),
+    ]
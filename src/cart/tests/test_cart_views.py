@@ -0,0 +1,88 @@
+# src/cart/tests/test_cart_views.py
+import pytest
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from cart.infrastructure.models import CartItem
+from products.infrastructure.models import Brand, Product
+
+
+def error_attrs(response):
+    return {error['attr'] for error in response.json()['errors']}
+
+
+@pytest.mark.django_db
+class TestCartItemViews:
+    @pytest.fixture
+    def api_client(self):
+        return APIClient()
+
+    @pytest.fixture
+    def owner(self, user_model):
+        return user_model.objects.create_user(username="owner", email="owner@example.com", password="password123")
+
+    @pytest.fixture
+    def stranger(self, user_model):
+        return user_model.objects.create_user(username="stranger", email="stranger@example.com", password="password123")
+
+    @pytest.fixture
+    def products(self):
+        brand = Brand.objects.create(name="Test Brand")
+        return [
+            Product.objects.create(name=f"Game {i}", brand=brand, description="desc", price="10.00")
+            for i in range(2)
+        ]
+
+    @pytest.fixture
+    def cart_item(self, owner, products):
+        return CartItem.objects.create(user=owner, product=products[0], quantity=1)
+
+    @pytest.mark.negative
+    @pytest.mark.parametrize("method", ["get", "patch", "delete"])
+    def test_missing_user_id_is_rejected(self, api_client, cart_item, method):
+        url = reverse('cart-detail', kwargs={'pk': cart_item.pk})
+        response = getattr(api_client, method)(url)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert error_attrs(response) == {'user_id'}
+
+    @pytest.mark.negative
+    def test_invalid_user_id_is_rejected(self, api_client, cart_item):
+        url = reverse('cart-detail', kwargs={'pk': cart_item.pk})
+        response = api_client.get(url, {'user_id': 'abc'})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert error_attrs(response) == {'user_id'}
+
+    @pytest.mark.negative
+    def test_foreign_cart_item_is_not_found(self, api_client, cart_item, stranger):
+        url = reverse('cart-detail', kwargs={'pk': cart_item.pk})
+        assert api_client.get(url, {'user_id': stranger.pk}).status_code == status.HTTP_404_NOT_FOUND
+        assert api_client.delete(f'{url}?user_id={stranger.pk}').status_code == status.HTTP_404_NOT_FOUND
+        assert CartItem.objects.filter(pk=cart_item.pk).exists()
+
+    @pytest.mark.positive
+    def test_own_cart_item_is_returned(self, api_client, cart_item, owner):
+        url = reverse('cart-detail', kwargs={'pk': cart_item.pk})
+        response = api_client.get(url, {'user_id': owner.pk})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()['product']['id'] == cart_item.product_id
+
+    @pytest.mark.positive
+    def test_bulk_create(self, api_client, owner, products):
+        data = [{'user': owner.pk, 'product': product.pk, 'quantity': 2} for product in products]
+        response = api_client.post(reverse('cart-list'), data, format='json')
+        assert response.status_code == status.HTTP_201_CREATED
+        assert len(response.json()) == len(products)
+        assert CartItem.objects.filter(user=owner).count() == len(products)
+
+    @pytest.mark.negative
+    def test_bulk_create_with_duplicate_product(self, api_client, owner, products):
+        data = [
+            {'user': owner.pk, 'product': products[0].pk, 'quantity': 1},
+            {'user': owner.pk, 'product': products[1].pk, 'quantity': 1},
+            {'user': owner.pk, 'product': products[0].pk, 'quantity': 3},
+        ]
+        response = api_client.post(reverse('cart-list'), data, format='json')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert error_attrs(response) == {'product'}
+        assert not CartItem.objects.filter(user=owner).exists()
@@ -1,7 +1,11 @@
+from functools import lru_cache
+
 from django.core.validators import MinLengthValidator
 from django.db import models
 from django.utils.text import slugify
 
+_slugify_cached = lru_cache(maxsize=1024)(slugify)
+
 
 class Category(models.Model):
     name = models.CharField(max_length=100, unique=True, validators=[MinLengthValidator(1)])
@@ -13,7 +17,7 @@ class Category(models.Model):
 
     def save(self, *args, **kwargs):
         if not self.slug:
-            self.slug = slugify(self.name)
+            self.slug = _slugify_cached(self.name)
         self.full_clean()
         super().save(*args, **kwargs)
 
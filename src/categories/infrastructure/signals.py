@@ -0,0 +1,14 @@
+from categories.infrastructure.models import Category
+from common.cache import bump_cache_version
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+CATEGORY_LIST_CACHE = 'cat-list'
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_category_list_cache(sender, **kwargs):
+    # A read between the bump and the commit would re-cache the old rows under the new version
+    transaction.on_commit(lambda: bump_cache_version(CATEGORY_LIST_CACHE))
@@ -1,6 +1,8 @@
 from categories.infrastructure.models import Category
 from common.serializers import ExampleIgnoringModelSerializer
 
+CATEGORY_DATETIME_FORMAT = '%Y-%m-%dT%H:%M:%S.000Z'
+
 
 class CategorySerializer(ExampleIgnoringModelSerializer):
     class Meta:
@@ -10,8 +12,8 @@ class CategorySerializer(ExampleIgnoringModelSerializer):
             'id': {'read_only': False},
             'name': {'required': True},
             'image': {'required': False, 'allow_blank': True},
-            'creationAt': {'source': 'created_at', 'read_only': False, 'format': '%Y-%m-%dT%H:%M:%S.000Z'},
-            'updatedAt': {'source': 'updated_at', 'read_only': False, 'format': '%Y-%m-%dT%H:%M:%S.000Z'},
+            'creationAt': {'source': 'created_at', 'read_only': False, 'format': CATEGORY_DATETIME_FORMAT},
+            'updatedAt': {'source': 'updated_at', 'read_only': False, 'format': CATEGORY_DATETIME_FORMAT},
         }
 
 
@@ -1,37 +1,87 @@
 from rest_framework import generics
 from common.permissions import ReadOnlyOrAuthenticated
+from common.renderers import ORJSONRenderer
 from categories.infrastructure.models import Category
-from categories.interfaces.serializers import CategorySerializer, PatchedCategorySerializer
+from categories.infrastructure.signals import CATEGORY_LIST_CACHE
+from common.cache import build_request_cache_key
+from django.core.cache import cache
+from categories.interfaces.serializers import CATEGORY_DATETIME_FORMAT, CategorySerializer, PatchedCategorySerializer
 from drf_spectacular.utils import extend_schema, OpenApiExample
+from rest_framework.response import Response
+
+CATEGORY_EXAMPLE_VALUE = {'id': 1, 'name': 'Хіти', 'image': '', 'creationAt': '2025-07-04T12:00:00.000Z',
+                          'updatedAt': '2025-07-05T12:00:00.000Z'}
+
+CATEGORY_LIST_EXAMPLE = OpenApiExample(
+    name='Список категорій',
+    summary='GET /api/categories/',
+    value=[CATEGORY_EXAMPLE_VALUE],
+    response_only=True
+)
+CATEGORY_CREATE_EXAMPLE = OpenApiExample(
+    name='Створення категорії',
+    summary='POST /api/categories/',
+    value={'name': 'Нові', 'image': 'https://.../new.jpg'},
+    request_only=True
+)
+CATEGORY_RETRIEVE_EXAMPLE = OpenApiExample(
+    name='Отримати категорію',
+    summary='GET /api/categories/{id}/',
+    value=CATEGORY_EXAMPLE_VALUE,
+    response_only=True
+)
+CATEGORY_PATCH_EXAMPLE = OpenApiExample(
+    name='Оновити категорію',
+    summary='PATCH /api/categories/{id}/',
+    value={'name': 'Хіти секретні'},
+    request_only=True
+)
+
+CATEGORY_LIST_CACHE_TIMEOUT = 60
 
 
 @extend_schema(tags=['Categories'])
 class CategoryListCreateView(generics.ListCreateAPIView):
     permission_classes = [ReadOnlyOrAuthenticated]
+    renderer_classes = [ORJSONRenderer]
     queryset = Category.objects.all().order_by('id')
     serializer_class = CategorySerializer
 
     @extend_schema(
         responses={200: CategorySerializer(many=True)},
         tags=['Categories'],
-        examples=[
-            OpenApiExample(
-                name='Список категорій',
-                summary='GET /api/categories/',
-                value=[{'id': 1, 'name': 'Хіти', 'image': '', 'creationAt': '2025-07-04T12:00:00.000Z',
-                        'updatedAt': '2025-07-05T12:00:00.000Z'}],
-                response_only=True
-            ),
-            OpenApiExample(
-                name='Створення категорії',
-                summary='POST /api/categories/',
-                value={'name': 'Нові', 'image': 'https://.../new.jpg'},
-                request_only=True
-            )
-        ]
+        examples=[CATEGORY_LIST_EXAMPLE, CATEGORY_CREATE_EXAMPLE]
     )
     def get(self, *args, **kwargs): return super().get(*args, **kwargs)
 
+    def list(self, request, *args, **kwargs):
+        cache_key = build_request_cache_key(CATEGORY_LIST_CACHE, request)
+        data = cache.get(cache_key)
+        if data is None:
+            data = self.build_list_data()
+            cache.set(cache_key, data, CATEGORY_LIST_CACHE_TIMEOUT)
+        return Response(data)
+
+    def build_list_data(self):
+        queryset = self.filter_queryset(self.get_queryset()).values(
+            'id', 'name', 'image', 'created_at', 'updated_at'
+        )
+        page = self.paginate_queryset(queryset)
+        rows = queryset if page is None else page
+        data = [
+            {
+                'id': row['id'],
+                'name': row['name'],
+                'image': row['image'],
+                'creationAt': row['created_at'].strftime(CATEGORY_DATETIME_FORMAT),
+                'updatedAt': row['updated_at'].strftime(CATEGORY_DATETIME_FORMAT),
+            }
+            for row in rows
+        ]
+        if page is not None:
+            return self.get_paginated_response(data).data
+        return data
+
     def post(self, *args, **kwargs):
         return super().post(*args, **kwargs)
 
@@ -42,23 +92,10 @@ class CategoryListCreateView(generics.ListCreateAPIView):
     tags=['Categories'],
     request=PatchedCategorySerializer,
     responses={200: CategorySerializer},
-    examples=[
-        OpenApiExample(
-            name='Отримати категорію',
-            summary='GET /api/categories/{id}/',
-            value={'id': 1, 'name': 'Хіти', 'image': '', 'creationAt': '2025-07-04T12:00:00.000Z',
-                   'updatedAt': '2025-07-05T12:00:00.000Z'},
-            response_only=True
-        ),
-        OpenApiExample(
-            name='Оновити категорію',
-            summary='PATCH /api/categories/{id}/',
-            value={'name': 'Хіти секретні'},
-            request_only=True
-        )
-    ]
+    examples=[CATEGORY_RETRIEVE_EXAMPLE, CATEGORY_PATCH_EXAMPLE]
 )
 class CategoryRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
     permission_classes = [ReadOnlyOrAuthenticated]
+    renderer_classes = [ORJSONRenderer]
     queryset = Category.objects.all().order_by('id')
     serializer_class = CategorySerializer
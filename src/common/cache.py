@@ -0,0 +1,23 @@
+import time
+
+from django.core.cache import cache
+
+
+def _version_key(namespace):
+    return f'{namespace}:version'
+
+
+def get_cache_version(namespace):
+    return cache.get_or_set(_version_key(namespace), time.time_ns(), timeout=None)
+
+
+def bump_cache_version(namespace):
+    try:
+        cache.incr(_version_key(namespace))
+    except ValueError:
+        cache.set(_version_key(namespace), time.time_ns(), timeout=None)
+
+
+def build_request_cache_key(namespace, request):
+    # Cursor pages carry absolute next/previous links, so host and scheme are part of the key
+    return f'{namespace}:{get_cache_version(namespace)}:{request.build_absolute_uri()}'
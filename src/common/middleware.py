@@ -0,0 +1,20 @@
+import cProfile
+import os
+import time
+
+from django.conf import settings
+
+
+class CProfileMiddleware:
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.profile_dir = settings.PROFILE_DIR
+        os.makedirs(self.profile_dir, exist_ok=True)
+
+    def __call__(self, request):
+        profiler = cProfile.Profile()
+        response = profiler.runcall(self.get_response, request)
+        path = request.path.strip('/').replace('/', '.') or 'root'
+        profiler.dump_stats(os.path.join(self.profile_dir, f'{request.method}.{path}.{time.time_ns()}.prof'))
+        return response
@@ -0,0 +1,7 @@
+from django.conf import settings
+
+
+def get_stripe():
+    import stripe
+    stripe.api_key = settings.STRIPE_SECRET_KEY
+    return stripe
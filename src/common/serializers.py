@@ -1,7 +1,108 @@
+import copy
+from collections.abc import Mapping
+from operator import attrgetter
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
 from rest_framework import serializers
+from rest_framework.fields import SkipField
+from rest_framework.relations import PKOnlyObject
+from rest_framework.utils import model_meta
+
+
+class CachedFieldsMixin:
+
+    def get_fields(self):
+        cls = type(self)
+        if '_cached_fields' not in cls.__dict__:
+            cls._cached_fields = super().get_fields()
+        # Bound fields keep a reference to their parent, so every instance needs its own copies
+        return copy.deepcopy(cls._cached_fields)
+
+
+class ColumnAttributeMixin:
+
+    def get_attribute_readers(self):
+        readers = self.__dict__.get('_attribute_readers')
+        if readers is None:
+            columns = {field.attname for field in self.Meta.model._meta.concrete_fields}
+            readers = []
+            for field in self._readable_fields:
+                source_attrs = field.source_attrs
+                # A loaded column value is never callable, so a plain getattr matches field.get_attribute
+                if len(source_attrs) == 1 and source_attrs[0] in columns:
+                    readers.append((field, attrgetter(source_attrs[0])))
+                else:
+                    readers.append((field, field.get_attribute))
+            self._attribute_readers = readers
+        return readers
+
+    def to_representation(self, instance):
+        # serializer.data before save() renders validated_data, which only field.get_attribute can read
+        if isinstance(instance, Mapping):
+            return super().to_representation(instance)
+        ret = {}
+        for field, read_attribute in self.get_attribute_readers():
+            try:
+                attribute = read_attribute(instance)
+            except SkipField:
+                continue
+            check_for_none = attribute.pk if isinstance(attribute, PKOnlyObject) else attribute
+            ret[field.field_name] = None if check_for_none is None else field.to_representation(attribute)
+        return ret
+
+
+class AutoPrefetchMixin:
+
+    @classmethod
+    def get_eager_loading(cls):
+        if '_eager_loading' not in cls.__dict__:
+            model = cls.Meta.model
+            relations = model_meta.get_field_info(model).relations
+            select_related, prefetch_related = [], []
+            for field in cls().fields.values():
+                if field.write_only or not field.source_attrs:
+                    continue
+                name = field.source_attrs[0]
+                relation = relations.get(name)
+                if relation is None:
+                    continue
+                if relation.to_many:
+                    prefetch_related.append((name, cls.get_pk_only_prefetch(model, name, field)))
+                # A plain pk field on a forward FK reads <name>_id from the row itself
+                elif isinstance(field, serializers.BaseSerializer) or len(field.source_attrs) > 1:
+                    select_related.append(name)
+            cls._eager_loading = (tuple(select_related), tuple(prefetch_related))
+        return cls._eager_loading
+
+    @staticmethod
+    def get_pk_only_prefetch(model, name, field):
+        if not (isinstance(field, serializers.ManyRelatedField)
+                and isinstance(field.child_relation, serializers.PrimaryKeyRelatedField)):
+            return None
+        try:
+            remote = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return None
+        # Related rows rendered as bare pks only need their key columns
+        columns = ('pk', remote.field.attname) if remote.one_to_many else ('pk',)
+        return remote.related_model, columns
+
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        select_related, prefetch_related = cls.get_eager_loading()
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        if prefetch_related:
+            queryset = queryset.prefetch_related(*(
+                name if pk_only is None else Prefetch(name, queryset=pk_only[0].objects.only(*pk_only[1]))
+                for name, pk_only in prefetch_related
+            ))
+        return queryset
 
 
-class ExampleIgnoringModelSerializer(serializers.ModelSerializer):
+class ExampleIgnoringModelSerializer(CachedFieldsMixin, ColumnAttributeMixin, AutoPrefetchMixin,
+                                     serializers.ModelSerializer):
     def build_standard_field(self, field_name, model_class):
         klass, field_kwargs = super().build_standard_field(field_name, model_class)
         field_kwargs.pop('example', None)
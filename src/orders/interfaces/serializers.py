@@ -1,17 +1,37 @@
+from operator import attrgetter
+
 from common.serializers import ExampleIgnoringModelSerializer
+from django.db import models
 from orders.infrastructure.models import Order
 from products.interfaces.serializers import ProductSerializer
 from rest_framework import serializers
 
+ORDER_DATETIME_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+
+
+def simple_product_row(product):
+    return {'id': product.id, 'name': product.name, 'price': str(product.price)}
+
+
+class SimpleProductListSerializer(serializers.ListSerializer):
+    def to_representation(self, data):
+        iterable = data.all() if isinstance(data, models.manager.BaseManager) else data
+        return [simple_product_row(product) for product in iterable]
+
 
 class SimpleProductSerializer(ExampleIgnoringModelSerializer):
+    # Read-only output: the DB already returns 2-place Decimals, so str() matches DecimalField without quantize
+    price = serializers.CharField(read_only=True)
+
     class Meta:
         model = ProductSerializer.Meta.model
         fields = ['id', 'name', 'price']
+        list_serializer_class = SimpleProductListSerializer
 
 
 class OrderSerializer(ExampleIgnoringModelSerializer):
     products = SimpleProductSerializer(many=True, read_only=True)
+    total_amount = serializers.CharField(read_only=True)
 
     class Meta:
         model = Order
@@ -21,31 +41,44 @@ class OrderSerializer(ExampleIgnoringModelSerializer):
             'user': {'read_only': True},
             'products': {'read_only': True},
             'total_amount': {'read_only': True},
-            'created_at': {'read_only': True, 'format': '%Y-%m-%dT%H:%M:%SZ'},
-            'updated_at': {'read_only': True, 'format': '%Y-%m-%dT%H:%M:%SZ'},
+            'created_at': {'read_only': True, 'format': ORDER_DATETIME_FORMAT},
+            'updated_at': {'read_only': True, 'format': ORDER_DATETIME_FORMAT},
             'status': {'read_only': True},
         }
 
 
-class SimpleProductInListSerializer(ExampleIgnoringModelSerializer):
-    class Meta:
-        model = ProductSerializer.Meta.model
-        fields = ['id', 'name', 'price']
+# Field order here is also the field list of OrderListSerializer
+ORDER_LIST_FIELD_READERS = {
+    'id': attrgetter('id'),
+    'products': lambda order: [simple_product_row(product) for product in order.products.all()],
+    'product_count': attrgetter('product_count'),
+    'total_amount': lambda order: str(order.total_amount),
+    'created_at': lambda order: order.created_at.strftime(ORDER_DATETIME_FORMAT),
+    'status': attrgetter('status'),
+}
+
+
+class OrderListListSerializer(serializers.ListSerializer):
+    def to_representation(self, data):
+        iterable = data.all() if isinstance(data, models.manager.BaseManager) else data
+        return [
+            {name: read(order) for name, read in ORDER_LIST_FIELD_READERS.items()}
+            for order in iterable
+        ]
 
 
 class OrderListSerializer(ExampleIgnoringModelSerializer):
-    products = SimpleProductInListSerializer(many=True, read_only=True)
-    product_count = serializers.SerializerMethodField()
+    products = SimpleProductSerializer(many=True, read_only=True)
+    total_amount = serializers.CharField(read_only=True)
 
     class Meta:
         model = Order
-        fields = ['id', 'products', 'product_count', 'total_amount', 'created_at', 'status']
+        fields = list(ORDER_LIST_FIELD_READERS)
+        list_serializer_class = OrderListListSerializer
         extra_kwargs = {
             'id': {'read_only': True},
+            'product_count': {'read_only': True},
             'total_amount': {'read_only': True},
-            'created_at': {'read_only': True, 'format': '%Y-%m-%dT%H:%M:%SZ'},
+            'created_at': {'read_only': True, 'format': ORDER_DATETIME_FORMAT},
             'status': {'read_only': True},
         }
-
-    def get_product_count(self, obj):
-        return obj.products.count()
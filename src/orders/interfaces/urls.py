@@ -1,6 +1,6 @@
 from django.urls import path
 
-from src.orders.interfaces.views import OrderListViewCreateView, CreatePaymentIntentView
+from orders.interfaces.views import OrderListViewCreateView, CreatePaymentIntentView
 
 urlpatterns = [
     path('', OrderListViewCreateView.as_view(), name='order-list-create'),
@@ -1,11 +1,16 @@
 import logging
-import stripe
 
 from cart.infrastructure.models import CartItem
+from common.payments import get_stripe
+from common.renderers import ORJSONRenderer
 from django.contrib.auth import get_user_model
+from django.contrib.postgres.aggregates import ArrayAgg
+from django.db import transaction
+from django.db.models import DecimalField, F, Prefetch, Sum
 from drf_spectacular.utils import extend_schema, OpenApiExample, OpenApiResponse, OpenApiParameter
 from orders.infrastructure.models import Order
 from orders.interfaces.serializers import OrderSerializer, OrderListSerializer
+from products.infrastructure.models import Product
 from rest_framework import status
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
@@ -18,6 +23,7 @@ User = get_user_model()
 @extend_schema(tags=['Orders'])
 class OrderListViewCreateView(APIView):
     permission_classes = [AllowAny]
+    renderer_classes = [ORJSONRenderer]
 
     @extend_schema(
         summary="Отримати історію замовлень",
@@ -51,7 +57,11 @@ class OrderListViewCreateView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        orders = Order.objects.filter(user_id=user_id).order_by('-created_at')
+        orders = (
+            Order.objects.filter(user_id=user_id)
+            .prefetch_related(Prefetch('products', queryset=Product.objects.only('id', 'name', 'price')))
+            .order_by('-created_at')
+        )
         serializer = OrderListSerializer(orders, many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
@@ -89,22 +99,35 @@ class OrderListViewCreateView(APIView):
         except ValueError:
             return Response({"detail": "Параметр 'user_id' має бути цілим числом."}, status=status.HTTP_400_BAD_REQUEST)
 
-        try:
-            user = User.objects.get(id=user_id)
-        except User.DoesNotExist:
-            return Response({"detail": f"Користувач з ID {user_id} не знайдений."}, status=status.HTTP_400_BAD_REQUEST)
-
-        carts = CartItem.objects.filter(user=user)
-        if not carts.exists():
-            return Response({"detail": "Кошик користувача порожній."}, status=status.HTTP_400_BAD_REQUEST)
-
-        products = [cart.product for cart in carts]
-        total_amount = sum(cart.product.price * cart.quantity for cart in carts)
-
-        order = Order.objects.create(user=user, total_amount=total_amount)
-        order.products.set(products)
-
-        carts.delete()
+        OrderProduct = Order.products.through
+        with transaction.atomic():
+            # Lock the cart rows so that only the lines that are ordered get deleted; items added meanwhile stay
+            cart_ids = list(
+                CartItem.objects.filter(user_id=user_id).select_for_update().values_list('pk', flat=True)
+            )
+            if not cart_ids:
+                # Cart rows reference the user, so the user only needs checking when the cart is empty
+                if not User.objects.filter(pk=user_id).exists():
+                    return Response({"detail": f"Користувач з ID {user_id} не знайдений."},
+                                    status=status.HTTP_400_BAD_REQUEST)
+                return Response({"detail": "Кошик користувача порожній."}, status=status.HTTP_400_BAD_REQUEST)
+
+            carts = CartItem.objects.filter(pk__in=cart_ids)
+            cart_totals = carts.aggregate(
+                total_amount=Sum(F('product__price') * F('quantity'),
+                                 output_field=DecimalField(max_digits=12, decimal_places=2)),
+                product_ids=ArrayAgg('product_id'),
+            )
+            order = Order.objects.create(
+                user_id=user_id,
+                total_amount=cart_totals['total_amount'],
+                product_count=len(cart_totals['product_ids'])
+            )
+            OrderProduct.objects.bulk_create(
+                [OrderProduct(order_id=order.id, product_id=product_id) for product_id in cart_totals['product_ids']],
+                ignore_conflicts=True
+            )
+            carts.delete()
 
         serializer = OrderSerializer(order)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
@@ -114,31 +137,30 @@ class CreatePaymentIntentView(APIView):
     permission_classes = [AllowAny]
 
     def post(self, request):
+        amount = request.data.get('amount')
+        if not amount:
+            return Response({'error': 'Необхідно вказати суму'}, status=status.HTTP_400_BAD_REQUEST)
         try:
-            amount = request.data.get('amount')
-            if not amount:
-                return Response({'error': 'Необхідно вказати суму'}, status=status.HTTP_400_BAD_REQUEST)
-
-            try:
-                amount = int(amount)
-            except (ValueError, TypeError):
-                return Response({'error': 'Сума повинна бути цілим числом в копійках'}, status=status.HTTP_400_BAD_REQUEST)
-
-            if amount <= 0:
-                return Response({'error': 'Сума повинна бути більшою за нуль'}, status=status.HTTP_400_BAD_REQUEST)
+            amount = int(amount)
+        except (ValueError, TypeError):
+            return Response({'error': 'Сума повинна бути цілим числом в копійках'}, status=status.HTTP_400_BAD_REQUEST)
+        if amount <= 0:
+            return Response({'error': 'Сума повинна бути більшою за нуль'}, status=status.HTTP_400_BAD_REQUEST)
 
+        stripe = get_stripe()
+        try:
             intent = stripe.PaymentIntent.create(
                 amount=amount,
                 currency='uah',
             )
-            logger.info(f"PaymentIntent створено: {intent.id}")
-            return Response({
-                'clientSecret': intent['client_secret']
-            })
-
         except stripe.error.StripeError as e:
-            logger.error(f"Помилка API Stripe: {e.user_message}")
+            logger.error("Помилка API Stripe: %s", e.user_message)
             return Response({'error': e.user_message}, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
-            logger.error(f"Непередбачена помилка при створенні PaymentIntent: {e}")
+            logger.error("Непередбачена помилка при створенні PaymentIntent: %s", e)
             return Response({'error': 'Сталася непередбачена помилка.'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+        logger.info("PaymentIntent створено: %s", intent.id)
+        return Response({
+            'clientSecret': intent['client_secret']
+        })
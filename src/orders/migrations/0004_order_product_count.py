@@ -0,0 +1,34 @@
+# Generated by Django 5.2.4 on 2026-10-16 10:00
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_product_count(apps, schema_editor):
+    Order = apps.get_model('orders', 'Order')
+    OrderProduct = Order.products.through
+    counts = (
+        OrderProduct.objects.filter(order_id=OuterRef('pk'))
+        .order_by()
+        .values('order_id')
+        .annotate(count=Count('*'))
+        .values('count')
+    )
+    Order.objects.update(product_count=Coalesce(Subquery(counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0003_order_orders_user_created_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='order',
+            name='product_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_product_count, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,6 @@
 import logging
 from django.db import models
+from django.db.models.functions import Upper
 from django.utils.text import slugify
 from categories.infrastructure.models import Category
 from django.core.exceptions import ValidationError
@@ -17,6 +18,12 @@ class GameType(models.Model):
 class Brand(models.Model):
     name = models.CharField(max_length=100, unique=True)
 
+    class Meta:
+        indexes = [
+            # Matches the UPPER(name) expression Django emits for name__iexact on PostgreSQL
+            models.Index(Upper('name'), name='brand_name_upper_idx'),
+        ]
+
     def __str__(self):
         return self.name
 
@@ -54,8 +61,14 @@ class Product(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['-created_at', 'id'], name='product_created_id_idx'),
+        ]
+
     def save(self, *args, **kwargs):
-        self.full_clean()
+        # Field and unique checks are done by serializers/forms and the DB constraints
+        self.clean()
         if not self.slug:
             self.slug = slugify(self.name)
         super().save(*args, **kwargs)
@@ -0,0 +1,17 @@
+from categories.infrastructure.models import Category
+from common.cache import bump_cache_version
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from products.infrastructure.models import Audience, Brand, GameType, Product, ProductImage, Review
+
+PRODUCT_LIST_CACHE = 'product-list'
+
+
+def invalidate_product_list_cache(sender=None, **kwargs):
+    # Product writes finish their M2M rows after post_save, so the bump waits for the commit
+    transaction.on_commit(lambda: bump_cache_version(PRODUCT_LIST_CACHE))
+
+
+for model in (Product, ProductImage, Review, Brand, GameType, Audience, Category):
+    post_save.connect(invalidate_product_list_cache, sender=model)
+    post_delete.connect(invalidate_product_list_cache, sender=model)
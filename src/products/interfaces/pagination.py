@@ -1,4 +1,4 @@
-from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.pagination import CursorPagination, LimitOffsetPagination
 from rest_framework.response import Response
 
 
@@ -10,6 +10,19 @@ class ProductLimitPagination(LimitOffsetPagination):
 
     def get_paginated_response(self, data):
         return Response({
-            'total_count': len(data),
+            'total_count': self.count,
             'results': data
         })
+
+
+class ProductCursorPagination(CursorPagination):
+    page_size = 20
+    max_page_size = 100
+    page_size_query_param = 'limit'
+    ordering = ('-created_at', 'id')
+
+    def get_ordering(self, request, queryset, view):
+        # The view's default ordering is for offset pages; keyset pages default to the indexed order
+        if request.query_params.get('ordering'):
+            return super().get_ordering(request, queryset, view)
+        return self.ordering
@@ -1,10 +1,43 @@
+from functools import lru_cache
+
 from categories.infrastructure.models import Category
-from common.serializers import ExampleIgnoringModelSerializer
+from common.serializers import CachedFieldsMixin, ExampleIgnoringModelSerializer
+from django.db import transaction
+from django.urls import get_script_prefix, reverse
 from products.infrastructure.models import (Product, ProductImage, GameType, Brand, Audience, Review)
+from products.infrastructure.signals import invalidate_product_list_cache
 from rest_framework import serializers
 
 
-class ProductImageDetailSerializer(serializers.ModelSerializer):
+@lru_cache(maxsize=None)
+def get_detail_url_parts(view_name, lookup_url_kwarg):
+    # The script prefix differs between mounts, so it is cut off here and added back per call
+    url = reverse(view_name, kwargs={lookup_url_kwarg: 0})[len(get_script_prefix()):]
+    prefix, _, suffix = url.rpartition('0')
+    return prefix, suffix
+
+
+class CachedRouteIdentityField(serializers.HyperlinkedIdentityField):
+    def get_url(self, obj, view_name, request, format):
+        if format or request is None or getattr(obj, 'pk', None) is None:
+            return super().get_url(obj, view_name, request, format)
+        prefix, suffix = get_detail_url_parts(view_name, self.lookup_url_kwarg)
+        return request.build_absolute_uri(f'{get_script_prefix()}{prefix}{getattr(obj, self.lookup_field)}{suffix}')
+
+
+def write_product_relation(product, field_name, objs, replace=False):
+    field = Product._meta.get_field(field_name)
+    through = field.remote_field.through
+    source, target = f'{field.m2m_field_name()}_id', f'{field.m2m_reverse_field_name()}_id'
+    if replace:
+        through.objects.filter(**{source: product.pk}).delete()
+    through.objects.bulk_create(
+        [through(**{source: product.pk, target: obj.pk}) for obj in objs],
+        ignore_conflicts=True
+    )
+
+
+class ProductImageDetailSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     product_id = serializers.IntegerField(source='product.id', read_only=True)
 
     class Meta:
@@ -21,21 +54,41 @@ class ProductImageUploadSerializer(serializers.Serializer):
     sort = serializers.IntegerField(required=False, default=0, min_value=0)
 
 
+class ProductImageSortSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    sort = serializers.IntegerField(min_value=0)
+
+
 class ProductImageReorderSerializer(serializers.Serializer):
-    images = serializers.ListField(
-        child=serializers.DictField(child=serializers.IntegerField()),
-        help_text="Список об'єктів {'id': int, 'sort': int}"
-    )
+    images = ProductImageSortSerializer(many=True, help_text="Список об'єктів {'id': int, 'sort': int}")
 
     def validate_images(self, value):
-        for item in value:
-            if 'id' not in item or 'sort' not in item:
-                raise serializers.ValidationError("Кожен елемент списку повинен містити 'id' та 'sort'.")
+        if len({item['id'] for item in value}) != len(value):
+            raise serializers.ValidationError("Ідентифікатори зображень не повинні повторюватися.")
         return value
 
+    def save(self, product_id):
+        sort_by_id = {item['id']: item['sort'] for item in self.validated_data['images']}
+        images = list(ProductImage.objects.filter(product_id=product_id, pk__in=sort_by_id).only('id', 'sort'))
+        if len(images) != len(sort_by_id):
+            found_ids = {image.id for image in images}
+            missing_id = next(image_id for image_id in sort_by_id if image_id not in found_ids)
+            raise serializers.ValidationError(f"Зображення з ID {missing_id} не належить цьому продукту.")
+        for image in images:
+            image.sort = sort_by_id[image.id]
+        with transaction.atomic():
+            ProductImage.objects.bulk_update(images, ['sort'], batch_size=500)
+            # bulk_update sends no post_save, so the cached product lists are dropped here
+            invalidate_product_list_cache()
+        return images
+
 
 class ProductSerializer(ExampleIgnoringModelSerializer):
     images = ProductImageDetailSerializer(many=True, read_only=True)
+    categories = serializers.PrimaryKeyRelatedField(many=True, queryset=Category.objects.all())
+    brand = serializers.PrimaryKeyRelatedField(queryset=Brand.objects.all())
+    types = serializers.PrimaryKeyRelatedField(many=True, queryset=GameType.objects.all(), required=False)
+    audiences = serializers.PrimaryKeyRelatedField(many=True, queryset=Audience.objects.all(), required=False)
 
     class Meta:
         model = Product
@@ -52,29 +105,6 @@ class ProductSerializer(ExampleIgnoringModelSerializer):
             'price': {'required': True},
             'created_at': {'read_only': True, 'format': '%Y-%m-%dT%H:%M:%SZ'},
             'updated_at': {'read_only': True, 'format': '%Y-%m-%dT%H:%M:%SZ'},
-            'types': {
-                'many': True,
-                'queryset': GameType.objects.all(),
-                'required': False
-            },
-            'categories': {
-                'many': True,
-                'queryset': Category.objects.all(),
-                'required': True
-            },
-            'audiences': {
-                'many': True,
-                'queryset': Audience.objects.all(),
-                'required': False
-            },
-            'brand': {
-                'queryset': Brand.objects.all(),
-                'required': True
-            },
-            'images': {
-                'many': True,
-                'read_only': True
-            },
             'discount': {'required': False},
             'stock': {'required': False},
             'stars': {'required': False},
@@ -85,59 +115,36 @@ class ProductSerializer(ExampleIgnoringModelSerializer):
         }
 
     def create(self, validated_data):
-        images_data = validated_data.pop('images', [])
+        validated_data.pop('images', None)
         types_data = validated_data.pop('types', [])
         categories_data = validated_data.pop('categories', [])
         audiences_data = validated_data.pop('audiences', [])
-        brand_name = validated_data.pop('brand')
-
-        brand, _ = Brand.objects.get_or_create(name=brand_name)
-        validated_data['brand'] = brand
 
-        product = Product.objects.create(**validated_data)
-
-        for t in types_data:
-            obj, _ = GameType.objects.get_or_create(name=t)
-            product.types.add(obj)
-
-        for c in categories_data:
-            product.categories.add(c)
-
-        for a in audiences_data:
-            obj, _ = Audience.objects.get_or_create(name=a)
-            product.audiences.add(obj)
+        with transaction.atomic():
+            product = Product.objects.create(**validated_data)
+            write_product_relation(product, 'types', types_data)
+            write_product_relation(product, 'categories', categories_data)
+            write_product_relation(product, 'audiences', audiences_data)
         return product
 
     def update(self, instance, validated_data):
-        images_data = validated_data.pop('images', None)
+        validated_data.pop('images', None)
         types_data = validated_data.pop('types', None)
         categories_data = validated_data.pop('categories', None)
         audiences_data = validated_data.pop('audiences', None)
-        brand_name = validated_data.pop('brand', None)
-
-        for attr, value in validated_data.items():
-            setattr(instance, attr, value)
-
-        if brand_name is not None:
-            brand, _ = Brand.objects.get_or_create(name=brand_name)
-            instance.brand = brand
-
-        instance.save()
 
-        if types_data is not None:
-            instance.types.clear()
-            for t in types_data:
-                obj, _ = GameType.objects.get_or_create(name=t)
-                instance.types.add(obj)
-
-        if categories_data is not None:
-            instance.categories.set(categories_data)
-
-        if audiences_data is not None:
-            instance.audiences.clear()
-            for a in audiences_data:
-                obj, _ = Audience.objects.get_or_create(name=a)
-                instance.audiences.add(obj)
+        with transaction.atomic():
+            # The changes go onto the row re-read under the lock, so a concurrent update is never written back stale
+            instance = Product.objects.select_for_update().get(pk=instance.pk)
+            for attr, value in validated_data.items():
+                setattr(instance, attr, value)
+            instance.save()
+            if types_data is not None:
+                write_product_relation(instance, 'types', types_data, replace=True)
+            if categories_data is not None:
+                write_product_relation(instance, 'categories', categories_data, replace=True)
+            if audiences_data is not None:
+                write_product_relation(instance, 'audiences', audiences_data, replace=True)
         return instance
 
     def validate_price(self, value):
@@ -146,6 +153,25 @@ class ProductSerializer(ExampleIgnoringModelSerializer):
         return value
 
 
+class ProductWriteSerializer(ProductSerializer):
+    # Writes never read images or reviews, so their nested fields are not built; responses keep the full shape
+    images = None
+
+    class Meta(ProductSerializer.Meta):
+        fields = [
+            'id', 'name', 'description', 'price',
+            'created_at', 'updated_at',
+            'categories', 'brand', 'types', 'audiences',
+            'discount', 'stock', 'stars'
+        ]
+        extra_kwargs = {
+            name: kwargs for name, kwargs in ProductSerializer.Meta.extra_kwargs.items() if name != 'reviews'
+        }
+
+    def to_representation(self, instance):
+        return ProductSerializer(instance, context=self.context).data
+
+
 class PatchedProductSerializer(ExampleIgnoringModelSerializer):
     class Meta:
         model = Product
@@ -188,7 +214,7 @@ class PatchedProductSerializer(ExampleIgnoringModelSerializer):
 
 
 class ProductImageSerializer(ExampleIgnoringModelSerializer):
-    url = serializers.HyperlinkedIdentityField(
+    url = CachedRouteIdentityField(
         view_name='photo-detail'
     )
     class Meta:
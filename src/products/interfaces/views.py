@@ -1,29 +1,172 @@
 import logging
+import re
+from types import MappingProxyType
 
+from common.cache import build_request_cache_key
 from common.permissions import ReadOnlyOrAuthenticated
+from django.core.cache import cache
+from django.db.models import Exists, OuterRef
 from drf_spectacular.utils import extend_schema, OpenApiExample, OpenApiParameter, OpenApiResponse
 from products.infrastructure.models import (Product, GameType, Audience, Brand, ProductImage, Review)
-from products.interfaces.pagination import ProductLimitPagination
+from products.infrastructure.signals import PRODUCT_LIST_CACHE
+from products.interfaces.pagination import ProductCursorPagination, ProductLimitPagination
 from products.interfaces.serializers import (ProductSerializer, PatchedProductSerializer, GameTypeSerializer,
                                              AudienceSerializer, BrandSerializer, ProductImageSerializer,
                                              ReviewSerializer, PatchedReviewSerializer,
                                              ProductImageUploadSerializer, ProductImageDetailSerializer,
-                                             ProductImageReorderSerializer)
+                                             ProductImageReorderSerializer, ProductWriteSerializer)
 from products.service import process_and_upload_product_image, delete_product_image_files
 from rest_framework import generics, filters, status
 from rest_framework.exceptions import NotFound, ValidationError
-from rest_framework.permissions import AllowAny
+from rest_framework.permissions import AllowAny, SAFE_METHODS
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 logger = logging.getLogger(__name__)
 
+CATEGORY_ID_RE = re.compile(r'\d+')
+# Comma-separated names with surrounding whitespace trimmed and empty items skipped
+NAME_LIST_RE = re.compile(r'[^,\s][^,]*[^,\s]|[^,\s]')
+PRODUCT_LIST_CACHE_TIMEOUT = 300
+
+PLACEHOLDER_IMAGE_DATA = MappingProxyType({
+    "id": 0,
+    "url_original": "https://placehold.co/1200x1200?text=No+Image",
+    "url_lg": "https://placehold.co/1200x1200?text=No+Image",
+    "url_md": "https://placehold.co/600x600?text=No+Image",
+    "url_sm": "https://placehold.co/300x300?text=No+Image",
+    "alt": "Немає зображення",
+    "sort": 0
+})
+
+PRODUCT_LIST_EXAMPLE = OpenApiExample(
+    name='Приклад фільтрації та сортування',
+    summary='GET /api/products/?search=шахи&brand=Hasbro&ordering=-price',
+    value=[{
+        "id": 1,
+        "name": "Шахи",
+        "description": "Класична стратегічна настільна гра.",
+        "price": "29.99",
+        "created_at": "2025-07-04T12:00:00Z",
+        "updated_at": "2025-07-05T12:00:00Z",
+        "categories": [1, 2],
+        "brand": "Hasbro",
+        "types": ["Стратегія"],
+        "audiences": ["Для дорослих"],
+        "images": [{"url_lg": "https://cdn.example.com/media/products/lg/chess.jpg    ",
+                    "url_md": "https://cdn.example.com/media/products/md/chess.jpg    ",
+                    "url_sm": "https://cdn.example.com/media/products/sm/chess.jpg    ", "alt": "Шахова дошка",
+                    "sort": 0}],
+        "discount": "10.00",
+        "stock": 100,
+        "stars": "4.50",
+        "reviews": [{"rating": "4.50", "comment": "Кльова гра!"}]
+    }],
+    response_only=True,
+)
+PRODUCT_DETAIL_EXAMPLE = OpenApiExample(
+    name='Деталі продукту з зображеннями',
+    summary='GET /api/products/{id}/',
+    description='Отримання інформації про продукт з наявними зображеннями.',
+    value={
+        "id": 1,
+        "name": "Шахи",
+        "description": "Класична стратегічна настільна гра.",
+        "price": "29.99",
+        "created_at": "2025-07-04T12:00:00Z",
+        "updated_at": "2025-07-05T12:00:00Z",
+        "categories": [1, 2],
+        "brand": "Hasbro",
+        "types": ["Стратегія"],
+        "audiences": ["Для дорослих"],
+        "images": [{"url_lg": "https://cdn.bgshop.work.gd/media/products/lg/chess.jpg",
+                    "url_md": "https://cdn.bgshop.work.gd/media/products/md/chess.jpg",
+                    "url_sm": "https://cdn.bgshop.work.gd/media/products/sm/chess.jpg", "alt": "Шахова дошка",
+                    "sort": 0}],
+        "discount": "10.00",
+        "stock": 100,
+        "stars": "4.50",
+        "reviews": [{"rating": "4.50", "comment": "Кльова гра!"}]
+    },
+    response_only=True,
+)
+PRODUCT_DETAIL_PLACEHOLDER_EXAMPLE = OpenApiExample(
+    name='Деталі продукту без зображень (з плейсхолдером)',
+    summary='GET /api/products/{id}/',
+    description='Отримання інформації про продукт без зображень. Плейсхолдер додається автоматично.',
+    value={
+        "id": 2,
+        "name": "Destinies",
+        "description": "Destinies is a competitive, story-driven board game...",
+        "price": "666.00",
+        "created_at": "2025-05-19T13:50:48Z",
+        "updated_at": "2025-06-19T11:31:45Z",
+        "categories": [],
+        "brand": 2,
+        "types": [],
+        "audiences": [],
+        "images": [
+            {
+                "id": 0,
+                "url_lg": "https://placehold.co/600x400?text=No+Image",
+                "url_md": "https://placehold.co/600x400?text=No+Image",
+                "url_sm": "https://placehold.co/600x400?text=No+Image",
+                "alt": "Placeholder Image",
+                "sort": 0
+            }
+        ],
+        "discount": "160.00",
+        "stock": 0,
+        "stars": "7.00",
+        "reviews": []
+    },
+    response_only=True,
+)
+PRODUCT_PATCH_EXAMPLE = OpenApiExample(
+    name='Приклад оновлення продукту',
+    summary='Оновлення ціни та кількості на складі',
+    description='PATCH-запит для зміни полів price та stock',
+    value={"price": 19.99, "stock": 50},
+    request_only=True,
+)
+PRODUCT_PATCH_RESPONSE_EXAMPLE = OpenApiExample(
+    name='Приклад відповіді після оновлення',
+    summary='Відповідь з оновленими даними продукту',
+    description='Повний об’єкт Product після успішного PATCH',
+    value={
+        "id": 1,
+        "name": "Шахи",
+        "description": "Класична стратегічна настільна гра.",
+        "price": "19.99",
+        "created_at": "2025-07-04T12:00:00Z",
+        "updated_at": "2025-07-06T14:30:00Z",
+        "categories": [1, 2],
+        "brand": "Hasbro",
+        "types": ["Стратегія"],
+        "audiences": ["Для дорослих"],
+        "images": [{"url_lg": "https://cdn.bgshop.work.gd/media/products/lg/chess.jpg",
+                    "url_md": "https://cdn.bgshop.work.gd/media/products/md/chess.jpg",
+                    "url_sm": "https://cdn.bgshop.work.gd/media/products/sm/chess.jpg", "alt": "Шахова дошка",
+                    "sort": 0}],
+        "discount": "10.00",
+        "stock": 50,
+        "stars": "4.50",
+        "reviews": [{"rating": "4.50", "comment": "Кльова гра!"}]
+    },
+    response_only=True,
+)
 
-class GenericListCreateView(generics.ListCreateAPIView):
+
+class EagerLoadingMixin:
+    def get_queryset(self):
+        return self.get_serializer_class().setup_eager_loading(super().get_queryset())
+
+
+class GenericListCreateView(EagerLoadingMixin, generics.ListCreateAPIView):
     permission_classes = [ReadOnlyOrAuthenticated]
 
 
-class GenericRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
+class GenericRetrieveUpdateDestroyView(EagerLoadingMixin, generics.RetrieveUpdateDestroyAPIView):
     permission_classes = [ReadOnlyOrAuthenticated]
 
     def get_object(self):
@@ -33,7 +176,22 @@ class GenericRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
             raise NotFound()
 
 
+class WriteSerializerMixin:
+    write_serializer_class = None
+
+    def get_serializer_class(self):
+        if self.request.method not in SAFE_METHODS:
+            return self.write_serializer_class
+        return super().get_serializer_class()
+
+
 @extend_schema(tags=['Products'])
+@extend_schema(
+    methods=['POST'],
+    tags=['Products'],
+    request=ProductWriteSerializer,
+    responses={201: ProductSerializer},
+)
 @extend_schema(
     responses={200: ProductSerializer(many=True)},
     tags=['Products'],
@@ -94,38 +252,22 @@ class GenericRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
             type=int,
             location=OpenApiParameter.QUERY
         ),
+        OpenApiParameter(
+            name='cursor',
+            description='Курсор для пагінації без зміщення (передайте порожнє значення для першої сторінки)',
+            required=False,
+            type=str,
+            location=OpenApiParameter.QUERY
+        ),
     ],
     examples=[
-        OpenApiExample(
-            name='Приклад фільтрації та сортування',
-            summary='GET /api/products/?search=шахи&brand=Hasbro&ordering=-price',
-            value=[{
-                "id": 1,
-                "name": "Шахи",
-                "description": "Класична стратегічна настільна гра.",
-                "price": "29.99",
-                "created_at": "2025-07-04T12:00:00Z",
-                "updated_at": "2025-07-05T12:00:00Z",
-                "categories": [1, 2],
-                "brand": "Hasbro",
-                "types": ["Стратегія"],
-                "audiences": ["Для дорослих"],
-                "images": [{"url_lg": "https://cdn.example.com/media/products/lg/chess.jpg    ",
-                            "url_md": "https://cdn.example.com/media/products/md/chess.jpg    ",
-                            "url_sm": "https://cdn.example.com/media/products/sm/chess.jpg    ", "alt": "Шахова дошка",
-                            "sort": 0}],
-                "discount": "10.00",
-                "stock": 100,
-                "stars": "4.50",
-                "reviews": [{"rating": "4.50", "comment": "Кльова гра!"}]
-            }],
-            response_only=True,
-        ),
+        PRODUCT_LIST_EXAMPLE,
     ],
 )
-class ProductListView(GenericListCreateView):
+class ProductListView(WriteSerializerMixin, GenericListCreateView):
     queryset = Product.objects.all()
     serializer_class = ProductSerializer
+    write_serializer_class = ProductWriteSerializer
     pagination_class = ProductLimitPagination
 
     filter_backends = [
@@ -136,44 +278,62 @@ class ProductListView(GenericListCreateView):
     ordering_fields = ['price', 'created_at', 'updated_at', 'name']
     ordering = ['id']
 
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator'):
+            use_cursor = 'cursor' in self.request.query_params
+            self._paginator = ProductCursorPagination() if use_cursor else self.pagination_class()
+        return self._paginator
+
     def get_queryset(self):
-        qs = super().get_queryset()
+        # slug is the only Product column ProductSerializer does not render
+        qs = super().get_queryset().defer('slug')
         params = self.request.query_params
 
         brand = params.get('brand')
         if brand:
             qs = qs.filter(brand__name__iexact=brand)
 
+        # Exists() keeps one row per product, so the M2M filters need no DISTINCT over the wide product rows
         cats = params.get('categories')
         if cats:
-            ids = [int(x) for x in cats.split(',') if x.isdigit()]
-            qs = qs.filter(categories__id__in=ids)
+            ids = list(map(int, CATEGORY_ID_RE.findall(cats)))
+            if not ids:
+                raise ValidationError({'categories': 'Параметр categories має містити ID категорій через кому.'})
+            qs = qs.filter(Exists(Product.categories.through.objects.filter(
+                product_id=OuterRef('pk'), category_id__in=ids)))
 
         types = params.get('types')
         if types:
-            names = [x.strip() for x in types.split(',') if x.strip()]
-            qs = qs.filter(types__name__in=names)
+            names = NAME_LIST_RE.findall(types)
+            qs = qs.filter(Exists(Product.types.through.objects.filter(
+                product_id=OuterRef('pk'), gametype__name__in=names)))
 
         aud = params.get('audiences')
         if aud:
-            names = [x.strip() for x in aud.split(',') if x.strip()]
-            qs = qs.filter(audiences__name__in=names)
+            names = NAME_LIST_RE.findall(aud)
+            qs = qs.filter(Exists(Product.audiences.through.objects.filter(
+                product_id=OuterRef('pk'), audience__name__in=names)))
 
-        return qs.distinct()
+        return qs
 
     def list(self, request, *args, **kwargs):
         limit_param = request.query_params.get('limit')
+        # Both paginators clamp limit to their max themselves, but would silently ignore a bad value
         if limit_param is not None:
             try:
                 limit_value = int(limit_param)
-                if limit_value <= 0:
-                    raise ValidationError("Limit must be a positive integer.")
-                if limit_value > 100:
-                    request.query_params = request.query_params.copy()
-                    request.query_params['limit'] = '100'
             except ValueError:
                 raise ValidationError("Limit must be an integer.")
-        return super().list(request, *args, **kwargs)
+            if limit_value <= 0:
+                raise ValidationError("Limit must be a positive integer.")
+
+        cache_key = build_request_cache_key(PRODUCT_LIST_CACHE, request)
+        data = cache.get(cache_key)
+        if data is None:
+            data = super().list(request, *args, **kwargs).data
+            cache.set(cache_key, data, PRODUCT_LIST_CACHE_TIMEOUT)
+        return Response(data)
 
 
 @extend_schema(tags=['Products'])
@@ -182,126 +342,37 @@ class ProductListView(GenericListCreateView):
     tags=['Products'],
     responses={200: ProductSerializer},
     examples=[
-        OpenApiExample(
-            name='Деталі продукту з зображеннями',
-            summary='GET /api/products/{id}/',
-            description='Отримання інформації про продукт з наявними зображеннями.',
-            value={
-                "id": 1,
-                "name": "Шахи",
-                "description": "Класична стратегічна настільна гра.",
-                "price": "29.99",
-                "created_at": "2025-07-04T12:00:00Z",
-                "updated_at": "2025-07-05T12:00:00Z",
-                "categories": [1, 2],
-                "brand": "Hasbro",
-                "types": ["Стратегія"],
-                "audiences": ["Для дорослих"],
-                "images": [{"url_lg": "https://cdn.bgshop.work.gd/media/products/lg/chess.jpg",
-                            "url_md": "https://cdn.bgshop.work.gd/media/products/md/chess.jpg",
-                            "url_sm": "https://cdn.bgshop.work.gd/media/products/sm/chess.jpg", "alt": "Шахова дошка",
-                            "sort": 0}],
-                "discount": "10.00",
-                "stock": 100,
-                "stars": "4.50",
-                "reviews": [{"rating": "4.50", "comment": "Кльова гра!"}]
-            },
-            response_only=True,
-        ),
-        OpenApiExample(
-            name='Деталі продукту без зображень (з плейсхолдером)',
-            summary='GET /api/products/{id}/',
-            description='Отримання інформації про продукт без зображень. Плейсхолдер додається автоматично.',
-            value={
-                "id": 2,
-                "name": "Destinies",
-                "description": "Destinies is a competitive, story-driven board game...",
-                "price": "666.00",
-                "created_at": "2025-05-19T13:50:48Z",
-                "updated_at": "2025-06-19T11:31:45Z",
-                "categories": [],
-                "brand": 2,
-                "types": [],
-                "audiences": [],
-                "images": [
-                    {
-                        "id": 0,
-                        "url_lg": "https://placehold.co/600x400?text=No+Image",
-                        "url_md": "https://placehold.co/600x400?text=No+Image",
-                        "url_sm": "https://placehold.co/600x400?text=No+Image",
-                        "alt": "Placeholder Image",
-                        "sort": 0
-                    }
-                ],
-                "discount": "160.00",
-                "stock": 0,
-                "stars": "7.00",
-                "reviews": []
-            },
-            response_only=True,
-        ),
+        PRODUCT_DETAIL_EXAMPLE,
+        PRODUCT_DETAIL_PLACEHOLDER_EXAMPLE,
     ],
 )
+@extend_schema(
+    methods=['PUT'],
+    tags=['Products'],
+    request=ProductWriteSerializer,
+    responses={200: ProductSerializer},
+)
 @extend_schema(
     methods=['PATCH'],
     tags=['Products'],
     request=PatchedProductSerializer,
     responses={200: ProductSerializer},
     examples=[
-        OpenApiExample(
-            name='Приклад оновлення продукту',
-            summary='Оновлення ціни та кількості на складі',
-            description='PATCH-запит для зміни полів price та stock',
-            value={"price": 19.99, "stock": 50},
-            request_only=True,
-        ),
-        OpenApiExample(
-            name='Приклад відповіді після оновлення',
-            summary='Відповідь з оновленими даними продукту',
-            description='Повний об’єкт Product після успішного PATCH',
-            value={
-                "id": 1,
-                "name": "Шахи",
-                "description": "Класична стратегічна настільна гра.",
-                "price": "19.99",
-                "created_at": "2025-07-04T12:00:00Z",
-                "updated_at": "2025-07-06T14:30:00Z",
-                "categories": [1, 2],
-                "brand": "Hasbro",
-                "types": ["Стратегія"],
-                "audiences": ["Для дорослих"],
-                "images": [{"url_lg": "https://cdn.bgshop.work.gd/media/products/lg/chess.jpg",
-                            "url_md": "https://cdn.bgshop.work.gd/media/products/md/chess.jpg",
-                            "url_sm": "https://cdn.bgshop.work.gd/media/products/sm/chess.jpg", "alt": "Шахова дошка",
-                            "sort": 0}],
-                "discount": "10.00",
-                "stock": 50,
-                "stars": "4.50",
-                "reviews": [{"rating": "4.50", "comment": "Кльова гра!"}]
-            },
-            response_only=True,
-        ),
+        PRODUCT_PATCH_EXAMPLE,
+        PRODUCT_PATCH_RESPONSE_EXAMPLE,
     ],
 )
-class ProductDetailView(GenericRetrieveUpdateDestroyView):
+class ProductDetailView(WriteSerializerMixin, GenericRetrieveUpdateDestroyView):
     queryset = Product.objects.all()
     serializer_class = ProductSerializer
+    write_serializer_class = ProductWriteSerializer
 
     def retrieve(self, request, *args, **kwargs):
         instance = self.get_object()
         serializer = self.get_serializer(instance)
         data = serializer.data
         if not data.get('images'):
-            placeholder_data = {
-                "id": 0,
-                "url_original": "https://placehold.co/1200x1200?text=No+Image",
-                "url_lg": "https://placehold.co/1200x1200?text=No+Image",
-                "url_md": "https://placehold.co/600x600?text=No+Image",
-                "url_sm": "https://placehold.co/300x300?text=No+Image",
-                "alt": "Немає зображення",
-                "sort": 0
-            }
-            data['images'] = [placeholder_data]
+            data['images'] = [dict(PLACEHOLDER_IMAGE_DATA)]
         return Response(data)
 
 
@@ -377,20 +448,6 @@ class ReviewRetrieveUpdateDestroyView(GenericRetrieveUpdateDestroyView):
     serializer_class = ReviewSerializer
 
 
-PLACEHOLDER_IMAGE_URL = "https://placehold.co/600x400?text=No+Image"
-
-
-def get_placeholder_image_data():
-    return {
-        "id": 0,
-        "url_lg": PLACEHOLDER_IMAGE_URL,
-        "url_md": PLACEHOLDER_IMAGE_URL,
-        "url_sm": PLACEHOLDER_IMAGE_URL,
-        "alt": "Placeholder Image",
-        "sort": 0
-    }
-
-
 @extend_schema(tags=['Products Images'])
 class ProductImageUploadView(APIView):
     permission_classes = [AllowAny]
@@ -462,17 +519,12 @@ class ProductImageDeleteView(APIView):
         }
     )
     def delete(self, request, product_id, image_id):
+        # A missing product leaves no image with this product_id, so one lookup covers both cases
         try:
-            product = Product.objects.get(pk=product_id)
-        except Product.DoesNotExist:
-            logger.warning(f"Product with id {product_id} not found for image deletion.")
-            raise NotFound("Продукт не знайдено.")
-
-        try:
-            image = ProductImage.objects.get(pk=image_id, product=product)
+            image = ProductImage.objects.get(pk=image_id, product_id=product_id)
         except ProductImage.DoesNotExist:
             logger.warning(f"ProductImage with id {image_id} not found for product {product_id}.")
-            raise NotFound("Зображення не знайдено.")
+            raise NotFound("Продукт або зображення не знайдено.")
 
         try:
             delete_product_image_files(image)
@@ -499,28 +551,24 @@ class ProductImageReorderView(APIView):
         }
     )
     def patch(self, request, product_id):
-        try:
-            product = Product.objects.get(pk=product_id)
-        except Product.DoesNotExist:
-            logger.warning(f"Product with id {product_id} not found for image reordering.")
-            raise NotFound("Продукт не знайдено.")
-
         serializer = ProductImageReorderSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
-        image_updates = serializer.validated_data['images']
-
-        for item in image_updates:
-            image_id = item['id']
-            new_sort_value = item['sort']
-            try:
-                image = ProductImage.objects.get(pk=image_id, product=product)
-                image.sort = new_sort_value
-                image.save(update_fields=['sort'])
-                logger.debug(f"Updated sort order for ProductImage {image_id} to {new_sort_value}.")
-            except ProductImage.DoesNotExist:
-                logger.warning(f"ProductImage {image_id} does not belong to product {product_id} during reorder.")
-                raise ValidationError(f"Зображення з ID {image_id} не належить цьому продукту.")
+        # The ownership query finds no images of a missing product, so existence is only checked
+        # on failure or when nothing was reordered
+        try:
+            images = serializer.save(product_id=product_id)
+        except ValidationError:
+            self.check_product_exists(product_id)
+            logger.warning(f"Reorder payload for product {product_id} references images of another product.")
+            raise
+        if not images:
+            self.check_product_exists(product_id)
 
         logger.info(f"Successfully reordered images for product {product_id}.")
         return Response({'message': 'Порядок зображень успішно оновлено.'}, status=status.HTTP_200_OK)
+
+    def check_product_exists(self, product_id):
+        if not Product.objects.filter(pk=product_id).exists():
+            logger.warning(f"Product with id {product_id} not found for image reordering.")
+            raise NotFound("Продукт не знайдено.")
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-16 10:00
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0002_product_product_created_id_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='brand',
+            index=models.Index(django.db.models.functions.text.Upper('name'), name='brand_name_upper_idx'),
+        ),
+    ]
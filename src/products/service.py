@@ -1,99 +1,112 @@
 import io
 import os
 import logging
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from urllib.parse import urlparse
 
 import boto3
 from botocore.exceptions import ClientError, NoCredentialsError
 
 from PIL import Image
-from django.core.files.base import ContentFile
+from django.core.files.base import File
 from django.core.files.storage import storages
-from django.db import models
+from django.db import models, transaction
 
 from products.infrastructure.models import Product, ProductImage
 
 logger = logging.getLogger(__name__)
 
+WEBP_VARIANTS = (
+    ('lg', (1200, 1200), 85),
+    ('md', (600, 600), 80),
+    ('sm', (300, 300), 75),
+)
+
+S3_DELETE_BATCH_SIZE = 1000
+
+IMAGE_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix='product-image')
+# Invalidations are fire-and-forget; a slow or retrying call must not hold a slot needed by uploads
+INVALIDATION_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix='cloudfront-invalidation')
+
+
+def _encode_webp(img, quality):
+    buffer = io.BytesIO()
+    img.save(buffer, format='WEBP', quality=quality, method=4)
+    buffer.seek(0)
+    return buffer
+
 
 def process_and_upload_product_image(product: Product, image_file, alt_text: str) -> ProductImage:
     original_name = os.path.splitext(image_file.name)[0]
     base_filename = f"{product.id}_{original_name}"
-    webp_images = {}
-
-    # Large (1200px)
-    with Image.open(image_file) as img:
-        if img.mode in ("RGBA", "LA", "P"):
-            img = img.convert("RGB")
-        img_lg = img.copy()
-        img_lg.thumbnail((1200, 1200), Image.LANCZOS)
-        buffer_lg = io.BytesIO()
-        img_lg.save(buffer_lg, format='WEBP', quality=85, method=6)
-        buffer_lg.seek(0)
-        webp_images['lg'] = buffer_lg
-
-    # Medium (600px)
-    with Image.open(image_file) as img:
-        if img.mode in ("RGBA", "LA", "P"):
-            img = img.convert("RGB")
-        img_md = img.copy()
-        img_md.thumbnail((600, 600), Image.LANCZOS)
-        buffer_md = io.BytesIO()
-        img_md.save(buffer_md, format='WEBP', quality=80, method=6)
-        buffer_md.seek(0)
-        webp_images['md'] = buffer_md
-
-    # Small (300px)
-    with Image.open(image_file) as img:
-        if img.mode in ("RGBA", "LA", "P"):
-            img = img.convert("RGB")
-        img_sm = img.copy()
-        img_sm.thumbnail((300, 300), Image.LANCZOS)
-        buffer_sm = io.BytesIO()
-        img_sm.save(buffer_sm, format='WEBP', quality=75, method=6)
-        buffer_sm.seek(0)
-        webp_images['sm'] = buffer_sm
+
+    # Decode once; each variant is then shrunk from the previous, larger one
+    image_file.seek(0)
+    with Image.open(image_file) as src:
+        img = src.convert("RGB") if src.mode in ("RGBA", "LA", "P") else src.copy()
+    encodes, aliases = {}, {}
+    for size_name, max_size, quality in WEBP_VARIANTS:
+        if encodes and img.width <= max_size[0] and img.height <= max_size[1]:
+            # Nothing left to shrink, so this tier points at the last encoded file
+            aliases[size_name] = encoded_name
+            continue
+        # The previous variant may still be encoding, so the next one is shrunk from a copy
+        if encodes:
+            img = img.copy()
+        # LANCZOS only pays off on large reductions; BICUBIC is much cheaper below 2x
+        ratio = max(img.width / max_size[0], img.height / max_size[1])
+        img.thumbnail(max_size, Image.LANCZOS if ratio >= 2 else Image.BICUBIC)
+        encodes[size_name] = IMAGE_EXECUTOR.submit(_encode_webp, img, quality)
+        encoded_name = size_name
+    webp_images = {size_name: future.result() for size_name, future in encodes.items()}
 
     storage = storages['default']
 
+    # One random draw supplies the 6-hex-digit suffix of every stored file
+    random_hex = uuid.uuid4().hex
     filenames = {
-        'lg': f"products/lg/{base_filename}_lg_{os.urandom(3).hex()}.webp",
-        'md': f"products/md/{base_filename}_md_{os.urandom(3).hex()}.webp",
-        'sm': f"products/sm/{base_filename}_sm_{os.urandom(3).hex()}.webp",
+        'lg': f"products/lg/{base_filename}_lg_{random_hex[:6]}.webp",
+        'md': f"products/md/{base_filename}_md_{random_hex[6:12]}.webp",
+        'sm': f"products/sm/{base_filename}_sm_{random_hex[12:18]}.webp",
     }
 
-    urls = {}
-    urls['url_lg'] = storage.url(
-        storage.save(filenames['lg'], ContentFile(webp_images['lg'].getvalue()))
-    )
-    urls['url_md'] = storage.url(
-        storage.save(filenames['md'], ContentFile(webp_images['md'].getvalue()))
-    )
-    urls['url_sm'] = storage.url(
-        storage.save(filenames['sm'], ContentFile(webp_images['sm'].getvalue()))
-    )
+    uploads = {
+        f'url_{size_name}': (filenames[size_name], File(buffer))
+        for size_name, buffer in webp_images.items()
+    }
 
     # --- Збереження оригіналу без змін ---
     image_file.seek(0)
     original_extension = os.path.splitext(image_file.name)[1]
-    unique_suffix = os.urandom(3).hex()
+    unique_suffix = random_hex[18:24]
     original_filename_for_storage = f"products/original/{base_filename}_original_{unique_suffix}{original_extension}"
-    original_file_path = storage.save(original_filename_for_storage, image_file)
-    url_original = storage.url(original_file_path)
+    uploads['url_original'] = (original_filename_for_storage, image_file)
+
+    # The uploads are independent S3 round trips; long-lived workers keep their thread-local S3 connections
+    futures = {
+        field: IMAGE_EXECUTOR.submit(storage.save, name, content)
+        for field, (name, content) in uploads.items()
+    }
+    urls = {field: storage.url(future.result()) for field, future in futures.items()}
+    for size_name, encoded_name in aliases.items():
+        urls[f'url_{size_name}'] = urls[f'url_{encoded_name}']
 
     # --- Створення запису в БД ---
-    max_sort_value = product.images.aggregate(models.Max('sort'))['sort__max'] or 0
-    new_sort_value = max_sort_value + 1
-
-    product_image = ProductImage.objects.create(
-        product=product,
-        url_original=url_original,
-        url_lg=urls['url_lg'],
-        url_md=urls['url_md'],
-        url_sm=urls['url_sm'],
-        alt=alt_text,
-        sort=new_sort_value
-    )
+    with transaction.atomic():
+        # Concurrent uploads for the same product wait here, so each one reads a fresh max sort
+        Product.objects.select_for_update().only('pk').get(pk=product.pk)
+        max_sort_value = product.images.aggregate(models.Max('sort'))['sort__max'] or 0
+        product_image = ProductImage.objects.create(
+            product=product,
+            url_original=urls['url_original'],
+            url_lg=urls['url_lg'],
+            url_md=urls['url_md'],
+            url_sm=urls['url_sm'],
+            alt=alt_text,
+            sort=max_sort_value + 1
+        )
 
     return product_image
 
@@ -106,6 +119,16 @@ def _extract_key_from_url(url: str) -> str:
     return parsed_url.path.lstrip('/')
 
 
+@lru_cache(maxsize=1)
+def _cloudfront_client(aws_access_key_id: str, aws_secret_access_key: str):
+    """Повертає спільний клієнт CloudFront, щоб не створювати його для кожної інвалідації."""
+    return boto3.client(
+        'cloudfront',
+        aws_access_key_id=aws_access_key_id,
+        aws_secret_access_key=aws_secret_access_key
+    )
+
+
 def invalidate_cloudfront_cache(paths_to_invalidate: list):
 
     """Інвалідує кеш CloudFront"""
@@ -131,13 +154,7 @@ def invalidate_cloudfront_cache(paths_to_invalidate: list):
                 "AWS credentials (AWS_S3_ACCESS_KEY_ID/AWS_S3_SECRET_ACCESS_KEY) not found in environment variables. Unable to invalidate CloudFront cache.")
             return
 
-        logger.info("Attempting to create CloudFront client with explicit credentials...")
-        cloudfront_client = boto3.client(
-            'cloudfront',
-            aws_access_key_id=aws_access_key_id,
-            aws_secret_access_key=aws_secret_access_key
-        )
-        logger.info("CloudFront client created successfully.")
+        cloudfront_client = _cloudfront_client(aws_access_key_id, aws_secret_access_key)
 
         logger.info("Attempting to create invalidation...")
         response = cloudfront_client.create_invalidation(
@@ -147,7 +164,7 @@ def invalidate_cloudfront_cache(paths_to_invalidate: list):
                     'Quantity': len(paths_to_invalidate),
                     'Items': paths_to_invalidate
                 },
-                'CallerReference': f'invalidation-{os.urandom(16).hex()}'
+                'CallerReference': f'invalidation-{uuid.uuid4().hex}'
             }
         )
         logger.info("CloudFront invalidation request sent.")
@@ -168,29 +185,51 @@ def invalidate_cloudfront_cache(paths_to_invalidate: list):
 
 def delete_product_image_files(product_image: ProductImage):
     """Видаляє всі файли зображення (оригінал, lg, md, sm) з S3 і інвалідує їх у CloudFront."""
+    delete_product_image_files_bulk([product_image])
+
+
+def delete_product_image_files_bulk(product_images):
+    """Видаляє файли кількох зображень пакетними запитами до S3 і однією інвалідацією CloudFront."""
     storage = storages['default']
     file_url_fields = ['url_original', 'url_lg', 'url_md', 'url_sm']
 
-    deleted_keys = []
+    keys = []
+    for product_image in product_images:
+        for field_name in file_url_fields:
+            url = getattr(product_image, field_name, None)
+            if not url:
+                continue
+            key = _extract_key_from_url(url)
+            if key:
+                keys.append(key)
+            else:
+                logger.warning(f"Could not extract key from URL: {url} (field: {field_name})")
+
+    # Aliased size tiers point at the same object, so each key is deleted and invalidated once
+    keys = list(dict.fromkeys(keys))
     paths_to_invalidate = []
-
-    for field_name in file_url_fields:
-        url = getattr(product_image, field_name, None)
-        if url:
-            try:
-                key = _extract_key_from_url(url)
-                if key:
-                    storage.delete(key)
-                    deleted_keys.append(key)
-                    paths_to_invalidate.append(f"/{key}")
-                    logger.info(f"Deleted file from storage: {key} (from {field_name})")
-                else:
-                    logger.warning(f"Could not extract key from URL: {url} (field: {field_name})")
-            except Exception as e:
-                logger.error(f"Error deleting file {url} (from {field_name}) from storage: {e}")
-
-    # Інвалідуємо кеш CloudFront для видалених файлів
+    s3_client = storage.connection.meta.client
+    for start in range(0, len(keys), S3_DELETE_BATCH_SIZE):
+        batch = keys[start:start + S3_DELETE_BATCH_SIZE]
+        try:
+            response = s3_client.delete_objects(
+                Bucket=storage.bucket_name,
+                Delete={'Objects': [{'Key': key} for key in batch], 'Quiet': True}
+            )
+        except Exception as e:
+            logger.error(f"Error deleting files {batch} from storage: {e}")
+            continue
+        # In quiet mode S3 only reports the keys it failed to delete
+        failed_keys = set()
+        for error in response.get('Errors', []):
+            failed_keys.add(error['Key'])
+            logger.error(f"Error deleting file {error['Key']} from storage: {error.get('Message')}")
+        deleted = [key for key in batch if key not in failed_keys]
+        paths_to_invalidate.extend(f"/{key}" for key in deleted)
+        logger.info(f"Deleted {len(deleted)} files from storage.")
+
+    # Інвалідуємо кеш CloudFront для видалених файлів у фоні, щоб не затримувати відповідь
     if paths_to_invalidate:
-        invalidate_cloudfront_cache(paths_to_invalidate)
+        INVALIDATION_EXECUTOR.submit(invalidate_cloudfront_cache, paths_to_invalidate)
     else:
         logger.info("No files were deleted, skipping CloudFront invalidation.")
@@ -0,0 +1,44 @@
+# src/products/tests/test_products_views.py
+from unittest import mock
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from products.infrastructure.models import Brand, Product, ProductImage
+
+CDN = "https://cdn.example.com"
+
+
+@pytest.mark.positive
+@pytest.mark.django_db
+def test_image_delete_queues_invalidation_without_waiting():
+    """DELETE removes each S3 key once and hands the CloudFront invalidation to its own executor."""
+    brand = Brand.objects.create(name="Test Brand")
+    product = Product.objects.create(name="Game", brand=brand, description="desc", price="10.00")
+    # The small tier reuses the medium file, as the upload does for small originals
+    image = ProductImage.objects.create(
+        product=product,
+        url_original=f"{CDN}/products/original/a.png",
+        url_lg=f"{CDN}/products/lg/a.webp",
+        url_md=f"{CDN}/products/md/a.webp",
+        url_sm=f"{CDN}/products/md/a.webp",
+    )
+    storage = mock.Mock(bucket_name="bucket")
+    storage.connection.meta.client.delete_objects.return_value = {}
+
+    with mock.patch('products.service.storages', {'default': storage}), \
+            mock.patch('products.service.INVALIDATION_EXECUTOR') as executor, \
+            mock.patch('products.service.invalidate_cloudfront_cache') as invalidate:
+        url = reverse('product-image-delete', kwargs={'product_id': product.pk, 'image_id': image.pk})
+        response = APIClient().delete(url)
+
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+    assert not ProductImage.objects.filter(pk=image.pk).exists()
+    expected_keys = ["products/original/a.png", "products/lg/a.webp", "products/md/a.webp"]
+    deleted = storage.connection.meta.client.delete_objects.call_args.kwargs['Delete']['Objects']
+    assert [obj['Key'] for obj in deleted] == expected_keys
+    executor.submit.assert_called_once_with(invalidate, [f"/{key}" for key in expected_keys])
+    # The response was sent without running the invalidation itself
+    invalidate.assert_not_called()
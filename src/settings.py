@@ -1,4 +1,4 @@
-import os, stripe
+import os
 
 from pathlib import Path
 from dotenv import load_dotenv
@@ -6,13 +6,17 @@ from datetime import timedelta
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
-local_env = BASE_DIR / 'local.env'
-prod_env = BASE_DIR / 'dev.env'
-load_dotenv(local_env if local_env.exists() else prod_env)
+# Containers that get their environment from the orchestrator can skip reading the env file
+if not os.getenv('NICEDICE_SKIP_DOTENV'):
+    local_env = BASE_DIR / 'local.env'
+    prod_env = BASE_DIR / 'dev.env'
+    load_dotenv(local_env if local_env.exists() else prod_env)
 
 SECRET_KEY = os.getenv('DJANGO_SECRET_KEY', 'dev-secret-key')
 DEBUG = True
 ALLOWED_HOSTS = os.getenv('ALLOWED_HOSTS', '*').split(',')
+# API-only deployments can drop the admin together with its session/message middleware
+ADMIN_ENABLED = os.getenv('DJANGO_ADMIN_ENABLED', 'true').lower() in ('1', 'true', 'yes')
 
 INSTALLED_APPS = [
     'django.contrib.admin',
@@ -27,6 +31,7 @@ INSTALLED_APPS = [
     'drf_spectacular',
     'drf_spectacular_sidecar',
     'corsheaders',
+    'django_filters',
     'storages',
 
     # JWT blacklist app
@@ -42,6 +47,8 @@ INSTALLED_APPS = [
     'users',
     'cart',
 ]
+if not ADMIN_ENABLED:
+    INSTALLED_APPS.remove('django.contrib.admin')
 
 STORAGES = {
     "default": {
@@ -98,6 +105,8 @@ REST_FRAMEWORK = {
     ],
     'DEFAULT_THROTTLE_RATES': {
         'forgot-password': '5/hour',
+        'login': '30/min',
+        'oauth': '20/min',
     },
 }
 
@@ -161,7 +170,8 @@ SIMPLE_JWT = {
     'ROTATE_REFRESH_TOKENS': True,
     'BLACKLIST_AFTER_ROTATION': True,
     'ALGORITHM': 'HS256',
-    'SIGNING_KEY': SECRET_KEY,
+    # HMAC keys are used as bytes, so encode once instead of on every sign/verify
+    'SIGNING_KEY': SECRET_KEY.encode(),
     'AUTH_HEADER_TYPES': ('Bearer',),
     'AUTH_TOKEN_CLASSES': ('rest_framework_simplejwt.tokens.AccessToken',),
     'PASSWORD_RESET_TIMEOUT': 3600,
@@ -176,6 +186,26 @@ MIDDLEWARE = [
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
+ADMIN_MIDDLEWARE = {
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+}
+if not ADMIN_ENABLED:
+    MIDDLEWARE = [middleware for middleware in MIDDLEWARE if middleware not in ADMIN_MIDDLEWARE]
+
+# Local profiling only, never in production: PROFILE=1 records requests with silk (UI under /silk/),
+# PROFILE=cprofile dumps a .prof file per request. Both use sys.setprofile, so only one runs at a time
+PROFILE = os.getenv('PROFILE', '').lower()
+if PROFILE in ('1', 'true', 'silk'):
+    INSTALLED_APPS += ['silk']
+    MIDDLEWARE += ['silk.middleware.SilkyMiddleware']
+    SILKY_PYTHON_PROFILER = True
+    SILKY_INTERCEPT_PERCENT = 10
+    SILKY_MAX_RECORDED_REQUESTS = 10000
+elif PROFILE == 'cprofile':
+    MIDDLEWARE += ['common.middleware.CProfileMiddleware']
+    PROFILE_DIR = os.getenv('PROFILE_DIR', '/tmp/prof')
 
 ROOT_URLCONF = 'src.urls'
 
@@ -208,12 +238,31 @@ DATABASES = {
         'PASSWORD': os.getenv('DB_PASSWORD', ''),
         'HOST': os.getenv('DB_HOST', 'localhost'),
         'PORT': os.getenv('DB_PORT', '5432'),
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', '600')),
+        'CONN_HEALTH_CHECKS': True,
+        # Views open transactions only around multi-statement writes
+        'ATOMIC_REQUESTS': False,
         'OPTIONS': {
             'sslmode': os.getenv('DB_SSLMODE', 'disable')
         },
     }
 }
 
+REDIS_URL = os.getenv('REDIS_URL')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
 LANGUAGE_CODE = 'en-us'
 TIME_ZONE = 'UTC'
 USE_I18N = True
@@ -221,6 +270,8 @@ USE_TZ = True
 
 STATIC_URL = '/static/'
 STATIC_ROOT = BASE_DIR / 'staticfiles'
+# Written at image build time by `manage.py spectacular`; served by /api/schema/ when present
+OPENAPI_SCHEMA_FILE = STATIC_ROOT / 'schema.json'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 SECURE_PROXY_SSL_HEADER = ('HTTP_X_FORWARDED_PROTO', 'https')
@@ -235,4 +286,3 @@ SOCIAL_AUTH_FACEBOOK_KEY = os.getenv('FACEBOOK_APP_ID', '')
 SOCIAL_AUTH_FACEBOOK_SECRET = os.getenv('FACEBOOK_APP_SECRET', '')
 
 STRIPE_SECRET_KEY = os.getenv('STRIPE_SECRET_KEY')
-stripe.api_key = STRIPE_SECRET_KEY
\ No newline at end of file
@@ -5,13 +5,17 @@ from datetime import timedelta
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
-local_env = BASE_DIR / 'local.env'
-prod_env = BASE_DIR / 'dev.env'
-load_dotenv(local_env if local_env.exists() else prod_env)
+# Containers that get their environment from the orchestrator can skip reading the env file
+if not os.getenv('NICEDICE_SKIP_DOTENV'):
+    local_env = BASE_DIR / 'local.env'
+    prod_env = BASE_DIR / 'dev.env'
+    load_dotenv(local_env if local_env.exists() else prod_env)
 
 SECRET_KEY = os.getenv('DJANGO_SECRET_KEY', 'dev-secret-key')
 DEBUG = True
 ALLOWED_HOSTS = os.getenv('ALLOWED_HOSTS', '*').split(',')
+# API-only deployments can drop the admin together with its session/message middleware
+ADMIN_ENABLED = os.getenv('DJANGO_ADMIN_ENABLED', 'true').lower() in ('1', 'true', 'yes')
 
 INSTALLED_APPS = [
     'django.contrib.admin',
@@ -26,6 +30,7 @@ INSTALLED_APPS = [
     'drf_spectacular',
     'drf_spectacular_sidecar',
     'corsheaders',
+    'django_filters',
 
     # JWT blacklist app
     'rest_framework_simplejwt.token_blacklist',
@@ -40,6 +45,8 @@ INSTALLED_APPS = [
     'users',
     'cart',
 ]
+if not ADMIN_ENABLED:
+    INSTALLED_APPS.remove('django.contrib.admin')
 
 # -----------------------------------
 # Email settings
@@ -85,6 +92,8 @@ REST_FRAMEWORK = {
     ],
     'DEFAULT_THROTTLE_RATES': {
         'forgot-password': '5/hour',
+        'login': '30/min',
+        'oauth': '20/min',
     },
 }
 
@@ -148,7 +157,8 @@ SIMPLE_JWT = {
     'ROTATE_REFRESH_TOKENS': True,
     'BLACKLIST_AFTER_ROTATION': True,
     'ALGORITHM': 'HS256',
-    'SIGNING_KEY': SECRET_KEY,
+    # HMAC keys are used as bytes, so encode once instead of on every sign/verify
+    'SIGNING_KEY': SECRET_KEY.encode(),
     'AUTH_HEADER_TYPES': ('Bearer',),
     'AUTH_TOKEN_CLASSES': ('rest_framework_simplejwt.tokens.AccessToken',),
     'PASSWORD_RESET_TIMEOUT': 3600,
@@ -163,6 +173,13 @@ MIDDLEWARE = [
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
+ADMIN_MIDDLEWARE = {
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+}
+if not ADMIN_ENABLED:
+    MIDDLEWARE = [middleware for middleware in MIDDLEWARE if middleware not in ADMIN_MIDDLEWARE]
 
 ROOT_URLCONF = 'src.urls'
 
@@ -201,6 +218,13 @@ DATABASES = {
     }
 }
 
+# Cache invalidation runs on commit, which never happens inside the rolled-back test transactions
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.dummy.DummyCache',
+    }
+}
+
 LANGUAGE_CODE = 'en-us'
 TIME_ZONE = 'UTC'
 USE_I18N = True
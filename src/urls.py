@@ -1,14 +1,13 @@
+from django.conf import settings
 from django.contrib import admin
 from django.urls import path, include
-from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView, SpectacularRedocView
+from drf_spectacular.views import SpectacularSwaggerView, SpectacularRedocView
 from drf_spectacular.renderers import OpenApiJsonRenderer
 
-from src.views import api_root
+from src.views import api_root, PrebuiltSpectacularAPIView
 
 urlpatterns = [
     path('', api_root, name='api-root'),
-    path('admin/', admin.site.urls),
-
     path('api/products/', include('products.interfaces.urls')),
     path('api/orders/', include('orders.interfaces.urls')),
     path('api/categories/', include('categories.interfaces.urls')),
@@ -18,9 +17,15 @@ urlpatterns = [
 
     path(
         'api/schema/',
-        SpectacularAPIView.as_view(renderer_classes=[OpenApiJsonRenderer]),
+        PrebuiltSpectacularAPIView.as_view(renderer_classes=[OpenApiJsonRenderer]),
         name='schema'
     ),
     path('api/swagger/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
     path('api/redoc/', SpectacularRedocView.as_view(url_name='schema'), name='redoc'),
 ]
+
+if settings.ADMIN_ENABLED:
+    urlpatterns.append(path('admin/', admin.site.urls))
+
+if 'silk' in settings.INSTALLED_APPS:
+    urlpatterns.append(path('silk/', include('silk.urls', namespace='silk')))
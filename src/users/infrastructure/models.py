@@ -1,13 +1,30 @@
-from django.contrib.auth.models import AbstractUser
+from django.contrib.auth.models import AbstractUser, UserManager as BaseUserManager
 from django.core.validators import MinLengthValidator
 from django.db import models
+from django.db.models.functions import Upper
+
+
+class UserManager(BaseUserManager):
+    def get_by_natural_key(self, username):
+        # Login matches the email case-insensitively through user_email_upper_idx
+        try:
+            return self.get(**{f'{self.model.USERNAME_FIELD}__iexact': username})
+        except self.model.MultipleObjectsReturned:
+            return self.get(**{self.model.USERNAME_FIELD: username})
 
 
 class User(AbstractUser):
     email = models.EmailField(unique=True, validators=[MinLengthValidator(1)])
 
+    objects = UserManager()
+
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['username']
 
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            models.Index(Upper('email'), name='user_email_upper_idx'),
+        ]
+
     def __str__(self):
         return self.email
@@ -1,22 +1,46 @@
+import hashlib
 import re
 
 import requests
 from common.serializers import ExampleIgnoringModelSerializer
-from common.serializers import ExampleIgnoringModelSerializer
 from django.contrib.auth import authenticate, get_user_model
 from django.contrib.auth.tokens import default_token_generator
+from django.core.cache import cache
 from django.core.exceptions import ValidationError as DjangoValidationError
 from django.core.validators import validate_email
+from django.db import IntegrityError, transaction
 from django.utils.encoding import force_str
 from django.utils.http import urlsafe_base64_decode
+from requests.adapters import HTTPAdapter
 from rest_framework import serializers
-from users.infrastructure.models import User
+from urllib3.util.retry import Retry
 from users.infrastructure.models import User
 
 UserModel = get_user_model()
-EMAIL_PATTERN = re.compile(
-    r"^(?=.{6,254}$)(?=.{1,64}@)[A-Za-z0-9._%+-]+@(?:[A-Za-z0-9-]+\.)+[A-Za-z]{2,}$"
-)
+EMAIL_MIN_LENGTH, EMAIL_MAX_LENGTH = 6, 254
+EMAIL_LOCAL_MAX_LENGTH = 64
+# Length limits are checked in is_valid_email_format, so the pattern needs no lookaheads
+EMAIL_PATTERN = re.compile(r"[A-Za-z0-9._%+-]+@(?:[A-Za-z0-9-]+\.)+[A-Za-z]{2,}")
+
+OAUTH_RESULT_CACHE_TIMEOUT = 120
+RESET_UID_MAX_DIGITS = 19
+
+# Shared keep-alive session, so OAuth logins reuse the TLS connections to the providers
+OAUTH_HTTP = requests.Session()
+OAUTH_HTTP.headers['User-Agent'] = 'NiceDice-backend'
+OAUTH_HTTP.mount('https://', HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=50,
+    max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=[502, 503, 504], raise_on_status=False),
+))
+
+
+def is_valid_email_format(value):
+    if not EMAIL_MIN_LENGTH <= len(value) <= EMAIL_MAX_LENGTH:
+        return False
+    if not 1 <= value.find('@') <= EMAIL_LOCAL_MAX_LENGTH:
+        return False
+    return EMAIL_PATTERN.fullmatch(value) is not None
 
 
 class UserSerializer(ExampleIgnoringModelSerializer):
@@ -58,21 +82,25 @@ class RegisterSerializer(ExampleIgnoringModelSerializer):
             validate_email(value)
         except DjangoValidationError:
             raise serializers.ValidationError("Invalid email format")
-        if not EMAIL_PATTERN.match(value):
+        if not is_valid_email_format(value):
             raise serializers.ValidationError("Email does not meet validation requirements")
-        if UserModel.objects.filter(email=value).exists():
-            raise serializers.ValidationError("User with this email already exists")
         return value
 
     def create(self, validated_data):
         email = validated_data['email']
-        user = UserModel.objects.create_user(
-            email=email,
-            username=email,
-            password=validated_data['password'],
-            first_name=validated_data['first_name'],
-            last_name=validated_data['last_name'],
-        )
+        # The unique constraints on email/username reject duplicates, so no existence query is made up front
+        try:
+            with transaction.atomic():
+                user = UserModel.objects.create_user(
+                    email=email,
+                    username=email,
+                    password=validated_data['password'],
+                    first_name=validated_data['first_name'],
+                    last_name=validated_data['last_name'],
+                    is_active=False,
+                )
+        except IntegrityError:
+            raise serializers.ValidationError({'email': ["User with this email already exists"]})
         return user
 
 
@@ -101,17 +129,20 @@ class ForgotPasswordSerializer(serializers.Serializer):
 
 
 class ResetPasswordSerializer(serializers.Serializer):
-    uid = serializers.CharField(required=True)
-    access_token = serializers.CharField(required=True)
+    uid = serializers.CharField(required=True, max_length=32)
+    token = serializers.CharField(required=True)
     new_password = serializers.CharField(write_only=True, min_length=8)
 
     def validate(self, attrs):
+        # Malformed uids are rejected without a query, and every failure gets the same message
         try:
             uid = force_str(urlsafe_base64_decode(attrs['uid']))
-            user = UserModel.objects.get(pk=uid)
-        except Exception:
-            raise serializers.ValidationError("Invalid uid")
-        if not default_token_generator.check_token(user, attrs['token']):
+        except (TypeError, ValueError):
+            uid = ''
+        user = None
+        if uid.isdigit() and len(uid) <= RESET_UID_MAX_DIGITS:
+            user = UserModel.objects.only('id', 'password', 'last_login', 'email').filter(pk=uid).first()
+        if user is None or not default_token_generator.check_token(user, attrs['token']):
             raise serializers.ValidationError("Invalid or expired token")
         attrs['user'] = user
         return attrs
@@ -131,12 +162,18 @@ class OAuthLoginSerializer(serializers.Serializer):
         provider = attrs.get('provider')
         token = attrs.get('access_token')
 
-        if provider == 'google':
-            user_data, error_detail = self._validate_google_token(token)
-        elif provider == 'facebook':
-            user_data, error_detail = self._validate_facebook_token(token)
-        else:
-            raise serializers.ValidationError("Unsupported provider")
+        # Only successful verifications are cached, so a rejected token is re-checked with the provider
+        cache_key = f"oauth:{provider}:{hashlib.sha256(token.encode()).hexdigest()}"
+        user_data, error_detail = cache.get(cache_key), None
+        if user_data is None:
+            if provider == 'google':
+                user_data, error_detail = self._validate_google_token(token)
+            elif provider == 'facebook':
+                user_data, error_detail = self._validate_facebook_token(token)
+            else:
+                raise serializers.ValidationError("Unsupported provider")
+            if user_data:
+                cache.set(cache_key, user_data, OAUTH_RESULT_CACHE_TIMEOUT)
 
         if not user_data:
             if error_detail:
@@ -154,7 +191,7 @@ class OAuthLoginSerializer(serializers.Serializer):
         try:
             url = "https://www.googleapis.com/oauth2/v3/userinfo"
             headers = {"Authorization": f"Bearer {access_token}"}
-            response = requests.get(url, headers=headers, timeout=10)
+            response = OAUTH_HTTP.get(url, headers=headers, timeout=10)
 
             if response.status_code == 200:
                 data = response.json()
@@ -187,7 +224,7 @@ class OAuthLoginSerializer(serializers.Serializer):
         try:
             # Получаем данные пользователя
             user_info_url = f"https://graph.facebook.com/me?access_token={access_token}&fields=id,email,first_name,last_name,picture"
-            user_response = requests.get(user_info_url, timeout=10)
+            user_response = OAUTH_HTTP.get(user_info_url, timeout=10)
 
             if user_response.status_code != 200:
                 try:
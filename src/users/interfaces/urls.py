@@ -1,9 +1,7 @@
 from django.urls import path
 from users.interfaces.views import (UserListCreateView, UserRetrieveUpdateDestroyView, RegisterView, LogoutView,
                                     ForgotPasswordView, ResetPasswordView, ActivateView, TokenObtainPairWithTag,
-                                    TokenRefreshWithTag, OAuthLoginView, )
-
-from src.users.interfaces.views import GetUserIdView, ResendActivationView
+                                    TokenRefreshWithTag, OAuthLoginView, GetUserIdView, ResendActivationView)
 
 urlpatterns = [
     # CRUD для користувачів
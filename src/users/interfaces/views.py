@@ -35,10 +35,6 @@ class LogoutSerializer(serializers.Serializer):
     refresh = serializers.CharField()
 
 
-class ResetPasswordSerializer(serializers.Serializer):
-    email = serializers.EmailField()
-
-
 @extend_schema(tags=['Users'])
 class UserListCreateView(generics.ListCreateAPIView):
     queryset = User.objects.all().order_by('id')
@@ -227,10 +223,13 @@ class RegisterView(APIView):
                 'error_message': exc.detail if hasattr(exc, 'detail') else str(exc)
             }, status=status.HTTP_400_BAD_REQUEST)
 
-        user = serializer.save()
-
-        user.is_active = False
-        user.save()
+        try:
+            user = serializer.save()
+        except serializers.ValidationError as exc:
+            return Response({
+                'error_code': 'REGISTRATION_FAILED',
+                'error_message': exc.detail
+            }, status=status.HTTP_400_BAD_REQUEST)
 
         uid = urlsafe_base64_encode(force_bytes(user.pk))
         token = default_token_generator.make_token(user)
@@ -538,6 +537,8 @@ class ResetPasswordView(APIView):
 )
 class TokenObtainPairWithTag(TokenObtainPairView):
     serializer_class = TokenObtainPairSerializer
+    throttle_classes = [ScopedRateThrottle]
+    throttle_scope = 'login'
 
 
 @extend_schema(
@@ -657,6 +658,9 @@ class TokenRefreshWithTag(TokenRefreshView):
     auth=[]
 )
 class OAuthLoginView(APIView):
+    # Rejects floods before they turn into outbound calls to Google/Facebook
+    throttle_classes = [ScopedRateThrottle]
+    throttle_scope = 'oauth'
     permission_classes = [AllowAny]
 
     @extend_schema(
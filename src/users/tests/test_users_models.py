@@ -1,4 +1,5 @@
 # src/users/tests/test_users_models.py
+from django.contrib.auth import authenticate
 from django.forms import ValidationError
 import pytest
 
@@ -46,3 +47,26 @@ def test_user_creation_validation(user_model, username, email, expected_exceptio
         user = user_model.objects.create_user(username=username, email=email)
         user.full_clean()  # Викликає ValidationError для email/пароля
         user.save()
+
+
+@pytest.mark.positive
+@pytest.mark.django_db
+def test_login_email_is_case_insensitive(user_model):
+    """Login finds the user whatever the case of the email."""
+    user = user_model.objects.create_user(username="mixed", email="Mixed.Case@example.com", password="password123")
+
+    assert user_model.objects.get_by_natural_key("mixed.case@EXAMPLE.com") == user
+    assert authenticate(email="MIXED.CASE@example.com", password="password123") == user
+
+
+@pytest.mark.positive
+@pytest.mark.django_db
+def test_login_case_variant_duplicates_fall_back_to_exact_match(user_model):
+    """Legacy accounts differing only by email case are told apart by an exact match."""
+    lower = user_model.objects.create_user(username="lower", email="dup@example.com", password="password123")
+    upper = user_model.objects.create_user(username="upper", email="DUP@example.com", password="password123")
+
+    assert user_model.objects.get_by_natural_key("dup@example.com") == lower
+    assert user_model.objects.get_by_natural_key("DUP@example.com") == upper
+    with pytest.raises(user_model.DoesNotExist):
+        user_model.objects.get_by_natural_key("Dup@Example.com")
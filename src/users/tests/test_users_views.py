@@ -1,8 +1,12 @@
 # src/users/tests/test_views.py
 import pytest
+from django.contrib.auth.tokens import default_token_generator
 from django.test import Client
 from django.urls import reverse
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
 from rest_framework import status
+from rest_framework.test import APIClient
 
 @pytest.mark.positive
 @pytest.mark.django_db
@@ -16,4 +20,111 @@ def test_api_root_renders_index():
     
     # Check status code
     assert response.status_code in  (status.HTTP_200_OK, status.HTTP_401_UNAUTHORIZED)
-    
\ No newline at end of file
+
+
+@pytest.mark.negative
+@pytest.mark.django_db
+def test_register_duplicate_email(user_model):
+    """Registering an email that is already taken returns the REGISTRATION_FAILED envelope."""
+    user_model.objects.create_user(username="taken@example.com", email="taken@example.com", password="password123")
+    data = {
+        "first_name": "Test",
+        "last_name": "User",
+        "email": "taken@example.com",
+        "password": "strongpassword123"
+    }
+
+    response = APIClient().post(reverse('register'), data)
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    body = response.json()
+    assert body['error_code'] == 'REGISTRATION_FAILED'
+    assert 'email' in body['error_message']
+    assert user_model.objects.filter(email="taken@example.com").count() == 1
+
+
+@pytest.fixture
+def reset_user(user_model):
+    return user_model.objects.create_user(username="reset@example.com", email="reset@example.com", password="oldpassword123")
+
+
+@pytest.mark.positive
+@pytest.mark.django_db
+def test_reset_password(reset_user):
+    """A valid uid and token set the new password and redirect with success."""
+    data = {
+        "uid": urlsafe_base64_encode(force_bytes(reset_user.pk)),
+        "token": default_token_generator.make_token(reset_user),
+        "new_password": "newpassword123"
+    }
+
+    response = APIClient().post(reverse('reset-password'), data)
+
+    assert response.status_code == status.HTTP_302_FOUND
+    assert 'reset_status=success' in response['Location']
+    reset_user.refresh_from_db()
+    assert reset_user.check_password("newpassword123")
+
+
+@pytest.mark.negative
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "uid,token",
+    [
+        ("fakeuid", None),                                      # Malformed uid
+        (urlsafe_base64_encode(b"1" * 20), None),               # Too many digits for a user id
+        (None, "bad-token"),                                    # Valid uid, wrong token
+    ]
+)
+def test_reset_password_rejected(reset_user, uid, token):
+    """A bad uid or token redirects with an error and keeps the old password."""
+    data = {
+        "uid": uid or urlsafe_base64_encode(force_bytes(reset_user.pk)),
+        "token": token or default_token_generator.make_token(reset_user),
+        "new_password": "newpassword123"
+    }
+
+    response = APIClient().post(reverse('reset-password'), data)
+
+    assert response.status_code == status.HTTP_302_FOUND
+    assert 'reset_status=error' in response['Location']
+    reset_user.refresh_from_db()
+    assert reset_user.check_password("oldpassword123")
+
+
+@pytest.mark.positive
+@pytest.mark.django_db
+def test_schema_served_from_prebuilt_file(settings, tmp_path):
+    """A plain JSON schema request streams the prebuilt file."""
+    schema_file = tmp_path / "schema.json"
+    schema_file.write_bytes(b'{"openapi": "3.0.3", "prebuilt": true}')
+    settings.OPENAPI_SCHEMA_FILE = schema_file
+
+    response = Client().get(reverse('schema'))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert b"".join(response.streaming_content) == schema_file.read_bytes()
+    assert response['Cache-Control'] == 'public, max-age=3600'
+
+
+@pytest.mark.positive
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "file_name,query",
+    [
+        ("missing.json", {}),                                   # No prebuilt file
+        ("schema.json", {"lang": "en"}),                        # Query params change the output
+    ]
+)
+def test_schema_generated_live(settings, tmp_path, file_name, query):
+    """Without a usable prebuilt file the schema is generated from the views."""
+    (tmp_path / "schema.json").write_bytes(b'{"openapi": "3.0.3", "prebuilt": true}')
+    settings.OPENAPI_SCHEMA_FILE = tmp_path / file_name
+
+    response = Client().get(reverse('schema'), query)
+
+    assert response.status_code == status.HTTP_200_OK
+    schema = response.json()
+    assert 'prebuilt' not in schema
+    assert schema['paths']
+
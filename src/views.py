@@ -1,5 +1,23 @@
+import os
+
+from django.conf import settings
+from django.http import FileResponse
 from django.shortcuts import render
+from drf_spectacular.renderers import OpenApiJsonRenderer
+from drf_spectacular.views import SpectacularAPIView
 
 
 def api_root(request):
     return render(request, 'index.html')
+
+
+class PrebuiltSpectacularAPIView(SpectacularAPIView):
+    def get(self, request, *args, **kwargs):
+        # The file only holds the plain JSON schema; other formats and query params (lang, ...) are generated live
+        schema_file = getattr(settings, 'OPENAPI_SCHEMA_FILE', None)
+        if (schema_file and not request.query_params
+                and isinstance(request.accepted_renderer, OpenApiJsonRenderer) and os.path.isfile(schema_file)):
+            response = FileResponse(open(schema_file, 'rb'), content_type=request.accepted_media_type)
+            response['Cache-Control'] = 'public, max-age=3600'
+            return response
+        return super().get(request, *args, **kwargs)